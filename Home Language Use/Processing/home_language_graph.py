@@ -1,8 +1,11 @@
+import os
+import sys
 import pandas as pd
 import networkx as nx
 import matplotlib.pyplot as plt
 from networkx.algorithms import bipartite
-import community as community_louvain  # pip install python-louvain
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from langnet.community_pyramid import load_or_build  # needs python-louvain
 
 # Load the processed CSV with country-language-percentage
 df = pd.read_csv("../Datas/spoken_languages_by_country.csv")
@@ -48,7 +51,11 @@ plt.show()
 
 # 3. Language–Language Network Projection + Louvain Clustering
 language_graph = bipartite.weighted_projected_graph(B, languages)
-partition = community_louvain.best_partition(language_graph, weight='weight')
+# all dendrogram levels and their quotient graphs are cached in pyramid_cache/
+pyramid = load_or_build(language_graph)
+partition = pyramid.partition()
+pyramid.level_summary().to_csv("language_communities.csv", index=False)
+print("Community sizes and members saved to 'language_communities.csv'.")
 
 # Visualize with colors for communities and sizes for importance
 plt.figure(figsize=(15, 12))
@@ -5,47 +5,57 @@
 """
 compute_centralities.py
 
-Builds the translation network and computes three centrality metrics:
+Builds the translation network and computes its centrality metrics
+on one sparse adjacency (see centrality.py):
 - weighted degree
 - betweenness centrality
 - PageRank
+- eigenvector, Katz, harmonic and closeness centrality
+- HITS hub/authority scores on the directed pair counts
 Outputs CSV + bar charts + degree vs betweenness scatter.
+
+With --directed, keeps the ordered pair counts as a directed graph and
+writes in/out strength and directed centralities to
+nodes_centrality_directed.csv instead.
+
+Usage: compute_centralities.py CSV [--directed]
 """
+import os
 import sys
-import pandas as pd
-import networkx as nx
 import matplotlib.pyplot as plt
+from pair_counts import load_pair_counts
+from pair_graph import build_csr
+from centrality import DIRECTED_METRICS, METRICS, centralities, directed_centralities
+
+def directed_main(df):
+    nodes, A = build_csr(df, mode='directed')
+    print(f"Directed graph: {len(nodes)} nodes, {A.nnz} edges")
+    dfm = directed_centralities(nodes, A, workers=os.cpu_count() or 1)
+    dfm.to_csv('nodes_centrality_directed.csv', index=False)
+    print("Saved nodes_centrality_directed.csv")
+    for col in DIRECTED_METRICS:
+        print(f"\nTop 10 by {col}:")
+        print(dfm.nlargest(10,col)[['language',col]].to_string(index=False))
 
-def main(csv_path):
-    df = pd.read_csv(csv_path, names=['source','target','count'], header=None)
-    df['count'] = pd.to_numeric(df['count'], errors='coerce').fillna(0).astype(int)
 
-    # Build graph
-    G = nx.Graph()
-    for _, r in df.iterrows():
-        if r['count'] > 0:
-            G.add_edge(r['source'], r['target'], weight=r['count'])
-    print(f"Graph: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
+def main(csv_path, directed=False):
+    df = load_pair_counts(csv_path)
+    if directed:
+        directed_main(df)
+        return
 
-    # Weighted degree
-    deg = dict(G.degree(weight='weight'))
-    # Betweenness (distance=1/weight)
-    dist = {(u,v):1/d['weight'] for u,v,d in G.edges(data=True)}
-    dist.update({(v,u):w for (u,v),w in dist.items()})
-    bc = nx.betweenness_centrality(G, weight=lambda u,v,d: dist[(u,v)], normalized=True)
-    # PageRank
-    pr = nx.pagerank(G, weight='weight')
+    # Build adjacency (undirected for most metrics, directed counts for HITS)
+    nodes, W = build_csr(df)
+    _, W_directed = build_csr(df, mode='directed', nodes=nodes)
+    print(f"Graph: {len(nodes)} nodes, {(W.nnz + W.diagonal().astype(bool).sum()) // 2} edges")
 
-    # Collate
-    dfm = pd.DataFrame({'language': list(G.nodes())})
-    dfm['weighted_degree'] = dfm['language'].map(deg).fillna(0).astype(int)
-    dfm['betweenness'] = dfm['language'].map(bc).fillna(0.0)
-    dfm['pagerank'] = dfm['language'].map(pr).fillna(0.0)
+    # All metrics, the independent ones concurrently
+    dfm = centralities(nodes, W, W_directed, workers=os.cpu_count() or 1)
     dfm.to_csv('nodes_centrality.csv', index=False)
     print("Saved nodes_centrality.csv")
 
     # Top-10 tables
-    for col in ['weighted_degree','betweenness','pagerank']:
+    for col in METRICS:
         print(f"\nTop 10 by {col}:")
         print(dfm.nlargest(10,col)[['language',col]].to_string(index=False))
 
@@ -75,7 +85,10 @@ def main(csv_path):
     print("Saved degree_vs_betweenness.png")
 
 if __name__=='__main__':
-    if len(sys.argv)!=2:
+    args = sys.argv[1:]
+    directed = '--directed' in args
+    args = [a for a in args if a != '--directed']
+    if len(args)!=1:
         print(__doc__)
         sys.exit(1)
-    main(sys.argv[1])
+    main(args[0], directed=directed)
@@ -2,18 +2,25 @@
 """
 cultural_alignment.py
 
-Loads translation_network_louvain.gml, maps each language to a
+Loads translation_network_louvain.graph (or the .gml), maps each language to a
 Huntington civilization, and visualizes/measures how well
 the Louvain clusters align with cultural spheres.
 """
+import os
+import sys
 import networkx as nx
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.metrics import normalized_mutual_info_score, adjusted_rand_score
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from langnet.graph_store import load_graph
 
 # 1) Load graph and extract clusters
-G = nx.read_gml('translation_network_louvain.gml')
+graph_path = 'translation_network_louvain.graph'
+if not os.path.exists(graph_path):
+    graph_path = 'translation_network_louvain.gml'
+G = load_graph(graph_path)
 partition = nx.get_node_attributes(G, 'cluster')
 df = pd.DataFrame(partition.items(), columns=['language','cluster'])
 
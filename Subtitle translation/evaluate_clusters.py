@@ -2,17 +2,21 @@
 """
 evaluate_clusters.py
 
-Given translation_network_louvain.gml, 
+Given translation_network_louvain.graph (or .gml),
 print full membership, compute confusion matrix vs Huntington civilizations,
 and report Normalized Mutual Information.
 """
+import os
+import sys
 import networkx as nx
 import pandas as pd
 from sklearn.metrics import normalized_mutual_info_score
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from langnet.graph_store import load_graph
 
-def main(gml_path):
-    # 1) Load GML
-    G = nx.read_gml(gml_path)
+def main(graph_path):
+    # 1) Load graph (binary graph directory or GML)
+    G = load_graph(graph_path)
     partition = nx.get_node_attributes(G, 'cluster')
     clusters_df = pd.DataFrame(list(partition.items()), columns=['language','cluster'])
 
@@ -0,0 +1,139 @@
+"""
+louvain_sweep.py
+
+Multi-resolution, multi-seed Louvain with consensus clustering.
+
+Every (resolution, seed) run goes to a process pool and its partition is
+cached under louvain_cache/<graph hash>/ with the node list it labels, so reruns (or a wider sweep) only
+compute the missing runs. The runs are combined into a co-assignment matrix
+C, where C[i, j] is the fraction of runs that put languages i and j in the
+same community; average-linkage clustering of 1 - C cut at `threshold`
+gives the stable clusters, and each language's stability is its mean
+co-assignment with the other members of its cluster (NaN for singletons).
+"""
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+from networkx.algorithms.community import louvain_communities
+from scipy.cluster.hierarchy import fcluster, linkage
+from scipy.spatial.distance import squareform
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from langnet.graph_store import graph_hash
+
+CACHE_DIR = 'louvain_cache'
+
+_graph = None  # graph in worker processes
+
+
+def _init_worker(G):
+    global _graph
+    _graph = G
+
+
+def _run(params):
+    """Community label of every node for one (resolution, seed) run."""
+    resolution, seed = params
+    comms = louvain_communities(_graph, weight='weight', resolution=resolution, seed=seed)
+    label = {node: cid for cid, comm in enumerate(comms) for node in comm}
+    return np.array([label[node] for node in _graph], dtype=np.int32)
+
+
+def _cache_path(cache_dir, resolution, seed):
+    # repr round-trips the float, so nearby resolutions never share a file
+    return os.path.join(cache_dir, f"r{resolution!r}_s{seed}.npz")
+
+
+def _save_labels(path, nodes, label):
+    np.savez(path, nodes=np.array([str(node) for node in nodes], dtype=str), label=label)
+
+
+def _load_labels(path, nodes):
+    """Cached labels reindexed to `nodes` (graph_hash ignores node order)."""
+    with np.load(path) as data:
+        by_name = dict(zip(data['nodes'].tolist(), data['label'].tolist()))
+    return np.array([by_name[str(node)] for node in nodes], dtype=np.int32)
+
+
+def louvain_sweep(G, resolutions, seeds, workers=1, cache_dir=CACHE_DIR):
+    """Run Louvain for every (resolution, seed) pair.
+
+    Returns (runs, labels): a DataFrame of resolution, seed, communities,
+    modularity per run, and a (runs x nodes) label array in list(G) order.
+    """
+    params = [(float(r), int(s)) for r in resolutions for s in seeds]
+    cache_dir = os.path.join(cache_dir, graph_hash(G)) if cache_dir else None
+    nodes = list(G)
+    labels = {}
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        for p in params:
+            if os.path.exists(_cache_path(cache_dir, *p)):
+                labels[p] = _load_labels(_cache_path(cache_dir, *p), nodes)
+
+    todo = [p for p in params if p not in labels]
+    print(f"Louvain sweep: {len(params)} runs, {len(params) - len(todo)} cached")
+    if workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(G,)) as pool:
+            results = list(pool.map(_run, todo))
+    else:
+        _init_worker(G)
+        results = [_run(p) for p in todo]
+    for p, result in zip(todo, results):
+        labels[p] = result
+        if cache_dir:
+            _save_labels(_cache_path(cache_dir, *p), nodes, result)
+
+    rows = []
+    for resolution, seed in params:
+        label = labels[(resolution, seed)]
+        comms = [set() for _ in range(label.max() + 1)]
+        for node, cid in zip(nodes, label.tolist()):
+            comms[cid].add(node)
+        rows.append((resolution, seed, len(comms),
+                     nx.community.modularity(G, comms, weight='weight', resolution=resolution)))
+    runs = pd.DataFrame(rows, columns=['resolution', 'seed', 'communities', 'modularity'])
+    return runs, np.vstack([labels[p] for p in params])
+
+
+def coassignment(labels):
+    """C[i, j] = fraction of runs in which nodes i and j share a community."""
+    n = labels.shape[1]
+    C = np.zeros((n, n))
+    for label in labels:
+        onehot = np.zeros((n, label.max() + 1))
+        onehot[np.arange(n), label] = 1
+        C += onehot @ onehot.T
+    return C / len(labels)
+
+
+def consensus_clusters(nodes, C, threshold=0.5):
+    """Stable clusters from a co-assignment matrix.
+
+    Returns a DataFrame of language, cluster, stability, largest clusters
+    first. Members of a cluster are co-assigned in `threshold` of the runs
+    on average (average linkage).
+    """
+    n = len(nodes)
+    if n == 1:
+        cluster = np.zeros(1, dtype=int)
+    else:
+        distance = squareform(1 - C, checks=False)
+        cluster = fcluster(linkage(distance, method='average'), t=1 - threshold, criterion='distance') - 1
+
+    # renumber by size, largest cluster = 0
+    sizes = np.bincount(cluster)
+    rank = np.empty_like(sizes)
+    rank[np.argsort(-sizes, kind='stable')] = np.arange(len(sizes))
+    cluster = rank[cluster]
+
+    same = cluster[:, None] == cluster[None, :]
+    np.fill_diagonal(same, False)
+    with np.errstate(invalid='ignore'):
+        stability = (C * same).sum(axis=1) / same.sum(axis=1)
+    df = pd.DataFrame({'language': nodes, 'cluster': cluster, 'stability': stability})
+    return df.sort_values(['cluster', 'stability'], ascending=[True, False], ignore_index=True)
@@ -6,14 +6,31 @@ make_cluster_graph_louvain.py
 
 Builds a weighted translation network from OpenSubtitles pair counts,
 uses Louvain at resolution=1.0 to detect ~5–8 clusters,
-outputs GML, cluster-size bar chart, and network visualization.
+outputs the graph (binary graph_store format, plus GML with --gml),
+cluster-size bar chart, and network visualization.
+
+With --sweep, Louvain runs for every (resolution, seed) pair in parallel
+and the clusters are the consensus of all runs, with a per-language
+stability score (louvain_runs.csv, louvain_consensus.csv).
+
+Usage: make_cluster_graph_louvain.py CSV [RESOLUTION] [--gml] [--mode max|sum] [--seed N]
+                                     [--backbone disparity|noise] [--alpha A]
+       make_cluster_graph_louvain.py CSV --sweep [--resolutions R ...] [--seeds N] [--workers N]
 """
+import argparse
+import os
 import sys
 import pandas as pd
 import networkx as nx
 from networkx.algorithms.community import louvain_communities
 import matplotlib.pyplot as plt
 import collections
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from langnet.graph_store import write_graph
+from pair_counts import load_pair_counts
+from backbone import METHODS
+from pair_graph import MODES, build_graph
+from louvain_sweep import coassignment, consensus_clusters, louvain_sweep
 
 # Optional ISO-to-language mapping
 try:
@@ -26,28 +43,45 @@ except ImportError:
     iso_to_name = lambda code: code
 
 
-def main(csv_path, resolution=1.0, top_n=500):
+def consensus_partition(G, resolutions, seeds, workers=1, threshold=0.5):
+    runs, labels = louvain_sweep(G, resolutions, seeds, workers=workers)
+    runs.to_csv('louvain_runs.csv', index=False)
+    print("Saved per-run communities and modularity to louvain_runs.csv")
+    print(runs.groupby('resolution')[['communities', 'modularity']].agg(['mean', 'std']).to_string())
+
+    consensus = consensus_clusters(list(G), coassignment(labels), threshold=threshold)
+    consensus.to_csv('louvain_consensus.csv', index=False)
+    print("Saved consensus clusters and stability to louvain_consensus.csv")
+    print(consensus.groupby('cluster')['stability'].agg(['size', 'mean', 'min']).to_string())
+    nx.set_node_attributes(G, dict(zip(consensus['language'], consensus['stability'].fillna(0.0))), 'stability')
+    return dict(zip(consensus['language'], consensus['cluster'].tolist()))
+
+
+def main(csv_path, resolution=1.0, top_n=500, gml=False, mode='max', seed=0, sweep=None, backbone=None, alpha=0.05):
     # 1) Load pair counts
-    df = pd.read_csv(csv_path, names=['source','target','count'], header=None)
-    df['count'] = pd.to_numeric(df['count'], errors='coerce').fillna(0).astype(int)
+    df = load_pair_counts(csv_path)
     print(f"Loaded {len(df)} rows from {csv_path}")
 
     # 2) Build full graph
-    G = nx.Graph()
-    for _, r in df.iterrows():
-        if r['count'] > 0:
-            G.add_edge(r.source, r.target, weight=r['count'])
+    G = build_graph(df, mode=mode)
     print(f"Graph: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
 
-    # 3) Louvain community detection
-    comms = louvain_communities(G, weight='weight', resolution=resolution)
-    partition = {n: cid for cid, comm in enumerate(comms) for n in comm}
+    # 3) Louvain community detection (one seeded run, or the consensus of a sweep)
+    if sweep:
+        partition = consensus_partition(G, **sweep)
+        print(f"Louvain consensus: {len(set(partition.values()))} clusters")
+    else:
+        comms = louvain_communities(G, weight='weight', resolution=resolution, seed=seed)
+        partition = {n: cid for cid, comm in enumerate(comms) for n in comm}
+        print(f"Louvain: resolution={resolution}, seed={seed}, detected {len(comms)} clusters")
     nx.set_node_attributes(G, partition, 'cluster')
-    print(f"Louvain: resolution={resolution}, detected {len(comms)} clusters")
 
-    # 4) Save GML
-    nx.write_gml(G, 'translation_network_louvain.gml')
-    print("Saved GML to translation_network_louvain.gml")
+    # 4) Save graph (GML only on request, for Gephi)
+    write_graph(G, 'translation_network_louvain.graph')
+    print("Saved graph to translation_network_louvain.graph")
+    if gml:
+        nx.write_gml(G, 'translation_network_louvain.gml')
+        print("Saved GML to translation_network_louvain.gml")
 
     # 5) Cluster-size bar chart
     counts = collections.Counter(partition.values())
@@ -67,8 +101,11 @@ def main(csv_path, resolution=1.0, top_n=500):
     print("First 20 language → cluster assignments:")
     print(membership.head(20).to_string(index=False))
 
-    # 7) Subgraph of top-N edges
-    edge_list = sorted(G.edges(data=True), key=lambda x: x[2]['weight'], reverse=True)[:top_n]
+    # 7) Subgraph of top-N edges, or of the significant ones with --backbone
+    if backbone:
+        edge_list = build_graph(df, mode=mode, backbone=backbone, alpha=alpha).edges(data=True)
+    else:
+        edge_list = sorted(G.edges(data=True), key=lambda x: x[2]['weight'], reverse=True)[:top_n]
     H = nx.Graph()
     H.add_nodes_from(G.nodes(data=True))
     for u,v,d in edge_list:
@@ -89,7 +126,8 @@ def main(csv_path, resolution=1.0, top_n=500):
     labels = {n: iso_to_name(n) for n in H.nodes()}
     nx.draw_networkx_labels(H, pos, labels, font_size=8)
     nx.draw_networkx_edge_labels(H, pos, edge_labels=edge_labels, font_size=6)
-    plt.title(f"Top {top_n} Corridors – Louvain Clusters")
+    shown = f"{backbone.capitalize()} Backbone" if backbone else f"Top {top_n} Corridors"
+    plt.title(f"{shown} – Louvain Clusters")
     for cid in sorted(counts):
         plt.scatter([], [], c=[cmap(cid%20)], label=f"Cluster {cid}")
     plt.legend(scatterpoints=1, fontsize=8, loc='upper right')
@@ -100,9 +138,25 @@ def main(csv_path, resolution=1.0, top_n=500):
     plt.show()
 
 if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print(__doc__)
-        sys.exit(1)
-    path = sys.argv[1]
-    res = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
-    main(path, resolution=res)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Louvain clusters of the translation network")
+    parser.add_argument('csv_path', help="Path to opensubtitles_pair_counts.csv")
+    parser.add_argument('resolution', nargs='?', type=float, default=1.0)
+    parser.add_argument('--gml', action='store_true', help="Also write translation_network_louvain.gml")
+    parser.add_argument('--mode', choices=[m for m in MODES if m != 'directed'], default='max',
+                        help="How to combine the two directions of a pair")
+    parser.add_argument('--seed', type=int, default=0, help="Louvain random seed")
+    parser.add_argument('--sweep', action='store_true', help="Consensus of a (resolution, seed) sweep")
+    parser.add_argument('--resolutions', type=float, nargs='+', default=[0.5, 0.75, 1.0, 1.25, 1.5])
+    parser.add_argument('--seeds', type=int, default=10, help="Seeds per resolution in the sweep")
+    parser.add_argument('--threshold', type=float, default=0.5,
+                        help="Mean co-assignment required within a consensus cluster")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--backbone', choices=METHODS, help="Draw the significant corridors instead of the top 500")
+    parser.add_argument('--alpha', type=float, default=0.05, help="Backbone significance level")
+    args = parser.parse_args()
+    sweep = None
+    if args.sweep:
+        sweep = {'resolutions': args.resolutions, 'seeds': range(args.seeds),
+                 'workers': args.workers, 'threshold': args.threshold}
+    main(args.csv_path, resolution=args.resolution, gml=args.gml, mode=args.mode, seed=args.seed, sweep=sweep,
+         backbone=args.backbone, alpha=args.alpha)
@@ -0,0 +1,92 @@
+"""
+pair_counts.py
+
+Canonical loader for opensubtitles_pair_counts.csv, shared by every script
+in this directory.
+
+The CSV may or may not start with a `source,target,count` header; that is
+detected from the first line, so a header is never read as a zero-count
+edge. Language codes come back as one shared categorical and counts as
+int64. The parsed table is cached as a .npz next to the CSV, keyed on the
+file's SHA-256, so repeated runs skip CSV parsing altogether.
+"""
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = 'pair_counts_cache'
+COLUMNS = ['source', 'target', 'count']
+
+
+def file_checksum(path, chunk_size=1 << 24):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def has_header(path):
+    """True if the first line is a header rather than a (source, target, count) row."""
+    with open(path, 'r', encoding='utf-8') as f:
+        fields = f.readline().strip().split(',')
+    try:
+        float(fields[-1])
+    except (ValueError, IndexError):
+        return True
+    return False
+
+
+def parse_pair_counts(path):
+    """Parse the CSV into the typed source/target/count frame (no caching)."""
+    df = pd.read_csv(path, names=COLUMNS, header=0 if has_header(path) else None,
+                     dtype={'source': str, 'target': str, 'count': str})
+    df = df.dropna(subset=['source', 'target'])
+    count = pd.to_numeric(df['count'], errors='coerce').fillna(0).to_numpy(np.int64)
+    codes, languages = pd.factorize(pd.concat([df['source'], df['target']], ignore_index=True), sort=True)
+    n = len(df)
+    return _frame(codes[:n], codes[n:], languages.to_numpy(str), count)
+
+
+def _frame(source, target, languages, count):
+    dtype = pd.CategoricalDtype(languages)
+    return pd.DataFrame({
+        'source': pd.Categorical.from_codes(source, dtype=dtype),
+        'target': pd.Categorical.from_codes(target, dtype=dtype),
+        'count': count,
+    })
+
+
+def save_cache(path, df):
+    np.savez(path,
+             languages=np.asarray(df['source'].cat.categories, dtype=str),
+             source=df['source'].cat.codes.to_numpy(np.int32),
+             target=df['target'].cat.codes.to_numpy(np.int32),
+             count=df['count'].to_numpy(np.int64))
+
+
+def load_cache(path):
+    with np.load(path) as data:
+        return _frame(data['source'], data['target'], data['languages'], data['count'])
+
+
+def load_pair_counts(path, cache=True):
+    """Typed pair-count table for `path`, from the binary cache when it is current."""
+    if not cache:
+        return parse_pair_counts(path)
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    cache_path = os.path.join(cache_dir, f"{stem}-{file_checksum(path)[:16]}.npz")
+    if os.path.exists(cache_path):
+        return load_cache(cache_path)
+
+    df = parse_pair_counts(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    for name in os.listdir(cache_dir):
+        # drop caches of earlier versions of the same file
+        if name.startswith(f"{stem}-") and name.endswith('.npz') and len(name) == len(stem) + 21:
+            os.remove(os.path.join(cache_dir, name))
+    save_cache(cache_path, df)
+    return df
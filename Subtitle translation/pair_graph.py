@@ -0,0 +1,91 @@
+"""
+pair_graph.py
+
+Shared builder for the translation network, used by every script in this
+directory instead of df.iterrows() + G.add_edge.
+
+Rows of (source, target, count) are aggregated in one groupby over both
+directions, so a (target, source) row no longer silently overwrites the
+(source, target) one in an undirected graph. Modes:
+
+    max       undirected, weight = larger of the two directions (the default;
+              the OpenSubtitles counts are symmetric, so this reproduces them)
+    sum       undirected, weight = sum of both directions
+    directed  DiGraph, weight = sum of duplicate (source, target) rows
+
+The result is a networkx graph (build_graph, via add_weighted_edges_from)
+or a scipy CSR matrix plus node labels (build_csr). Instead of (or on top
+of) a fixed min_weight, `backbone` keeps only the statistically significant
+corridors (see backbone.py).
+"""
+import networkx as nx
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from backbone import significant
+
+MODES = ('max', 'sum', 'directed')
+
+
+def aggregate_pairs(df, mode='max', min_weight=1, backbone=None, alpha=0.05):
+    """One row per corridor: DataFrame of source, target, weight.
+
+    Undirected modes put the lexicographically smaller code in `source`.
+    Rows with count <= 0 are dropped first; `min_weight` applies to the
+    aggregated weight. With `backbone` ('disparity' or 'noise') only the
+    corridors significant at `alpha` are kept, scored on the whole graph.
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}, not {mode!r}")
+    df = df[df['count'] > 0]
+    source = df['source'].astype(str).to_numpy()
+    target = df['target'].astype(str).to_numpy()
+    if mode != 'directed':
+        swap = source > target
+        source, target = np.where(swap, target, source), np.where(swap, source, target)
+    pairs = pd.DataFrame({'source': source, 'target': target, 'weight': df['count'].to_numpy(np.int64)})
+    how = 'max' if mode == 'max' else 'sum'
+    edges = pairs.groupby(['source', 'target'], sort=False)['weight'].agg(how).reset_index()
+    if backbone:
+        codes, nodes = pd.factorize(pd.concat([edges['source'], edges['target']], ignore_index=True))
+        m = len(edges)
+        keep = significant(codes[:m], codes[m:], edges['weight'].to_numpy(), len(nodes),
+                           method=backbone, alpha=alpha, directed=mode == 'directed')
+        edges = edges[keep]
+    return edges[edges['weight'] >= min_weight]
+
+
+def build_graph(df, mode='max', min_weight=1, backbone=None, alpha=0.05):
+    """networkx Graph (or DiGraph for mode='directed') with integer 'weight' edges."""
+    edges = aggregate_pairs(df, mode, min_weight, backbone, alpha)
+    G = nx.DiGraph() if mode == 'directed' else nx.Graph()
+    G.add_weighted_edges_from(zip(edges['source'].tolist(), edges['target'].tolist(), edges['weight'].tolist()))
+    return G
+
+
+def build_csr(df, mode='max', min_weight=1, backbone=None, alpha=0.05, nodes=None):
+    """(nodes, W): node labels and a CSR weight matrix indexed like them.
+
+    W is symmetric for the undirected modes; W[i, j] is the i -> j count for
+    mode='directed'. Pass `nodes` to index W by a given node list (e.g. to
+    line a directed matrix up with an undirected one); other nodes' edges
+    are dropped.
+    """
+    edges = aggregate_pairs(df, mode, min_weight, backbone, alpha)
+    labels = pd.concat([edges['source'], edges['target']], ignore_index=True)
+    if nodes is None:
+        codes, nodes = pd.factorize(labels)
+    else:
+        codes = pd.Index(nodes).get_indexer(labels)
+    n, m = len(nodes), len(edges)
+    row, col = codes[:m], codes[m:]
+    weight = edges['weight'].to_numpy(np.float64)
+    known = (row >= 0) & (col >= 0)
+    row, col, weight = row[known], col[known], weight[known]
+    if mode != 'directed':
+        loop = row == col
+        row, col = np.concatenate([row, col[~loop]]), np.concatenate([col, row[~loop]])
+        weight = np.concatenate([weight, weight[~loop]])
+    W = sparse.csr_matrix((weight, (row, col)), shape=(n, n))
+    return list(nodes), W
@@ -12,6 +12,8 @@ import networkx as nx
 from networkx.algorithms.community import greedy_modularity_communities
 import matplotlib.pyplot as plt
 import collections
+from pair_counts import load_pair_counts
+from pair_graph import build_graph
 
 # Optional ISO-to-language mapping
 try:
@@ -25,17 +27,12 @@ except ImportError:
 
 
 def main(csv_path):
-    # Load CSV (no header assumed)
-    df = pd.read_csv(csv_path, names=['source','target','count'], header=None)
-    # Ensure numeric counts
-    df['count'] = pd.to_numeric(df['count'], errors='coerce').fillna(0).astype(int)
+    # Load pair counts (header detected, cached)
+    df = load_pair_counts(csv_path)
     print(f"Loaded {len(df)} rows from {csv_path}")
 
     # Build graph with only positive edges
-    G = nx.Graph()
-    for _, row in df.iterrows():
-        if row['count'] > 0:
-            G.add_edge(row['source'], row['target'], weight=row['count'])
+    G = build_graph(df)
     print(f"Graph: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges")
 
     # Community detection (greedy modularity fallback)
@@ -1,23 +1,27 @@
-import pandas as pd
+import os
+import sys
 import networkx as nx
 import matplotlib.pyplot as plt
-from networkx.algorithms.community import louvain_communities
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from pair_counts import load_pair_counts
+from pair_graph import build_graph
+from langnet.community_pyramid import load_or_build
 
 # Load data
-df = pd.read_csv('opensubtitles_pair_counts.csv')
+df = load_pair_counts('opensubtitles_pair_counts.csv')
 
 # Build graph
-G = nx.Graph()
-for _, row in df.iterrows():
-    G.add_edge(row['source'], row['target'], weight=row['count'])
+G = build_graph(df)
 
-# Detect clusters
-communities = list(louvain_communities(G, weight='weight'))
+# Detect clusters (cached Louvain dendrogram, reused across runs)
+pyramid = load_or_build(G)
 
 # Choose a cluster
 cluster_id = 2
-nodes = communities[cluster_id]
-subG = G.subgraph(nodes)
+subG = pyramid.cluster_subgraph(G, cluster_id)
+nodes = subG.nodes()
 
 # Layout and draw
 plt.figure(figsize=(8, 6))
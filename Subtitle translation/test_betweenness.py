@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+import pytest
+
+from betweenness import approximate_betweenness, betweenness_centrality
+from pair_counts import load_pair_counts
+from pair_graph import build_graph
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture(scope='module')
+def graph():
+    df = load_pair_counts(os.path.join(HERE, 'test', 'opensubtitles_pair_counts.csv'), cache=False)
+    return build_graph(df, min_weight=1000)
+
+
+@pytest.fixture(scope='module')
+def exact(graph):
+    bc = betweenness_centrality(graph)
+    return np.array([bc[node] for node in graph])
+
+
+@pytest.mark.parametrize('simultaneous', [False, True])
+def test_intervals_contain_exact_values(graph, exact, simultaneous):
+    for seed in range(5):
+        df = approximate_betweenness(graph, 45, seed=seed, simultaneous=simultaneous)
+        assert (df['ci_low'].to_numpy() <= exact + 1e-12).all()
+        assert (exact <= df['ci_high'].to_numpy() + 1e-12).all()
+
+
+def test_per_node_intervals_are_informative(graph, exact):
+    widths = []
+    for seed in range(5):
+        df = approximate_betweenness(graph, 45, seed=seed)
+        widths.append((df['ci_high'] - df['ci_low']).median())
+        # the top bridge is bounded away from 0
+        assert df['ci_low'].to_numpy()[exact.argmax()] > 0.2
+    assert np.mean(widths) < 0.35
+
+
+def test_all_pivots_is_exact(graph, exact):
+    df = approximate_betweenness(graph, len(graph), seed=0)
+    assert np.allclose(df['betweenness'], exact)
+    assert np.allclose(df['ci_low'], exact) and np.allclose(df['ci_high'], exact)
@@ -0,0 +1,74 @@
+"""
+translation_flow.py
+
+Directed view of the translation network: the ordered (source, target)
+pair counts are kept as a sparse matrix A, A[i, j] = count i -> j, instead
+of being folded into an undirected graph.
+
+    flow_strengths      in/out strength and net flow per language
+    corridor_asymmetry  per corridor: both directions, reciprocity, asymmetry
+    asymmetry_matrix    the full (A - A^T) / (A + A^T) matrix in one pass
+
+Asymmetry is (w_ij - w_ji) / (w_ij + w_ji) in [-1, 1] (positive: more i -> j);
+reciprocity is min(w_ij, w_ji) / max(w_ij, w_ji) in [0, 1].
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from pair_graph import build_csr
+
+
+def flow_matrix(df, backbone=None, alpha=0.05):
+    """(nodes, A): directed CSR matrix of the ordered pair counts."""
+    return build_csr(df, mode='directed', backbone=backbone, alpha=alpha)
+
+
+def flow_strengths(nodes, A):
+    out_strength = np.asarray(A.sum(axis=1)).ravel()
+    in_strength = np.asarray(A.sum(axis=0)).ravel()
+    total = out_strength + in_strength
+    with np.errstate(invalid='ignore'):
+        balance = (out_strength - in_strength) / total
+    return pd.DataFrame({
+        'language': list(nodes),
+        'out_strength': out_strength.astype(np.int64),
+        'in_strength': in_strength.astype(np.int64),
+        'net_flow': (out_strength - in_strength).astype(np.int64),
+        'flow_balance': balance,
+    }).sort_values('net_flow', ascending=False, ignore_index=True)
+
+
+def network_reciprocity(A):
+    """Share of the total weight that is reciprocated: sum min(w_ij, w_ji) / sum w_ij."""
+    A = sparse.csr_matrix(A, dtype=np.float64)
+    return float(A.minimum(A.T).sum() / A.sum()) if A.nnz else np.nan
+
+
+def corridor_asymmetry(nodes, A):
+    """One row per unordered corridor {i, j} with any flow, i < j by index."""
+    A = sparse.csr_matrix(A, dtype=np.float64)
+    upper = sparse.triu(A + A.T, k=1).tocoo()
+    i, j = upper.row, upper.col
+    forward = np.asarray(A[i, j]).ravel()
+    backward = np.asarray(A[j, i]).ravel()
+    total = forward + backward
+    labels = np.asarray(list(nodes), dtype=object)
+    return pd.DataFrame({
+        'source': labels[i],
+        'target': labels[j],
+        'forward': forward.astype(np.int64),
+        'backward': backward.astype(np.int64),
+        'total': total.astype(np.int64),
+        'reciprocity': np.minimum(forward, backward) / np.maximum(forward, backward),
+        'asymmetry': (forward - backward) / total,
+    }).sort_values('total', ascending=False, ignore_index=True)
+
+
+def asymmetry_matrix(nodes, A):
+    """Dense languages x languages DataFrame of (A - A^T) / (A + A^T), NaN without flow."""
+    dense = sparse.csr_matrix(A, dtype=np.float64).toarray()
+    total = dense + dense.T
+    with np.errstate(invalid='ignore', divide='ignore'):
+        matrix = np.where(total > 0, (dense - dense.T) / total, np.nan)
+    return pd.DataFrame(matrix, index=list(nodes), columns=list(nodes))
@@ -7,16 +7,24 @@ communities, colonial ties, small-language connectivity, and visualization.
 """
 import pandas as pd
 import networkx as nx
-import community as community_louvain
 import matplotlib.pyplot as plt
 import argparse
+import os
+import sys
+from betweenness import approximate_betweenness, betweenness_centrality
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from langnet.community_pyramid import load_or_build
+from pair_counts import load_pair_counts
+from backbone import METHODS
+from pair_graph import MODES, build_graph
+from threshold_sweep import threshold_sweep
+from centrality import directed_centralities
+from translation_flow import (asymmetry_matrix, corridor_asymmetry, flow_matrix, flow_strengths,
+                              network_reciprocity)
 
 
 def load_data(path):
-    df = pd.read_csv(path)
-    df = df.dropna(subset=['source', 'target', 'count'])
-    df['count'] = df['count'].astype(int)
-    return df
+    return load_pair_counts(path)
 
 
 def summary_statistics(df):
@@ -38,8 +46,8 @@ def top_translation_corridors(df, top_n=10):
 
 
 def weighted_degree(df):
-    deg_src = df.groupby('source')['count'].sum()
-    deg_tgt = df.groupby('target')['count'].sum()
+    deg_src = df.groupby('source', observed=True)['count'].sum()
+    deg_tgt = df.groupby('target', observed=True)['count'].sum()
     wdeg = deg_src.add(deg_tgt, fill_value=0).sort_values(ascending=False)
     wdeg_df = wdeg.reset_index()
     wdeg_df.columns = ['language', 'weighted_degree']
@@ -50,21 +58,49 @@ def weighted_degree(df):
     return wdeg_df
 
 
-def thresholded_subgraph(df, threshold):
-    H = nx.Graph()
-    for _, r in df[df['count'] >= threshold].iterrows():
-        w = r['count']
-        H.add_edge(r.source, r.target, weight=w)
+# backbone significance level for the core graph, per method; picked so the
+# core is a connected hub structure like the old 1e7 cutoff. The noise
+# backbone barely moves with alpha on counts this large and keeps every
+# language connected, so its core is the whole backbone.
+CORE_ALPHA = {'disparity': 0.01, 'noise': 0.001}
+
+
+def thresholded_subgraph(df, threshold, mode='max', backbone=None, alpha=0.05, giant=False):
+    H = build_graph(df, mode=mode, min_weight=threshold, backbone=backbone, alpha=alpha)
     comps = sorted(nx.connected_components(H), key=len, reverse=True)
     for i, comp in enumerate(comps[:5]):
         print(f"Component {i+1} (size {len(comp)}): {comp}")
+    if giant and comps:
+        H = H.subgraph(comps[0]).copy()
+        print(f"Keeping the giant component: {H.number_of_nodes()} nodes, {H.number_of_edges()} edges")
     return H
 
 
+def connectivity_sweep(df, mode='max'):
+    curve, joins = threshold_sweep(df, mode=mode)
+    curve.to_csv('threshold_sweep.csv', index=False)
+    joins.to_csv('giant_join.csv', index=False)
+    print(f"Saved connectivity at {len(curve)} cutoffs to threshold_sweep.csv")
+    print("Saved giant-component join weights to giant_join.csv")
+    print("Last 10 languages to join the giant component:")
+    print(joins.tail(10).to_string(index=False))
+
+    fig, ax = plt.subplots()
+    ax.plot(curve['cutoff'], curve['giant_size'], label='giant component size')
+    ax.plot(curve['cutoff'], curve['components'], label='components')
+    ax.set_xscale('log')
+    ax.set_xlabel('Edge weight cutoff')
+    ax.set_ylabel('Languages / components')
+    ax.set_title("Connectivity across edge-weight cutoffs")
+    ax.legend()
+    plt.savefig('threshold_sweep.png')
+    print("Saved threshold sweep plot to threshold_sweep.png")
+    plt.show()
+    return curve, joins
+
+
 def quick_betweenness(H):
-    dist = {(u, v): 1.0 / d['weight'] for u, v, d in H.edges(data=True)}
-    dist.update({(v, u): w for (u, v), w in dist.items()})
-    bc = nx.betweenness_centrality(H, weight=lambda u, v, d: dist[(u, v)], normalized=True)
+    bc = betweenness_centrality(H)
     top5 = sorted(bc.items(), key=lambda x: x[1], reverse=True)[:5]
     print("Top 5 bridges in thresholded graph:")
     for lang, score in top5:
@@ -72,19 +108,20 @@ def quick_betweenness(H):
     return bc
 
 
-def build_full_graph(df, min_weight=1000):
-    G = nx.Graph()
-    for _, r in df.iterrows():
-        count = r['count']
-        if count >= min_weight:
-            G.add_edge(r.source, r.target, weight=count)
-    print(f"Full graph: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges (min_weight={min_weight})")
+def build_full_graph(df, min_weight=1000, mode='max', backbone=None, alpha=0.05):
+    G = build_graph(df, mode=mode, min_weight=min_weight, backbone=backbone, alpha=alpha)
+    cutoff = f"{backbone} backbone, alpha={alpha}" if backbone else f"min_weight={min_weight}"
+    print(f"Full graph: {G.number_of_nodes()} nodes, {G.number_of_edges()} edges ({cutoff})")
     return G
 
 
-def compute_full_louvain(G):
-    print("Running Louvain community detection on full graph...")
-    partition = community_louvain.best_partition(G, weight='weight')
+def compute_full_louvain(G, seed=0):
+    print(f"Running Louvain community detection on full graph (seed={seed})...")
+    # every dendrogram level and its quotient graph are cached for drill-down
+    pyramid = load_or_build(G, random_state=seed)
+    for level in range(pyramid.depth):
+        print(f"Level {level}: {len(pyramid.quotients[level][0])} communities")
+    partition = pyramid.partition()
     clusters = pd.DataFrame.from_dict(partition, orient='index', columns=['cluster']).reset_index()
     clusters.columns = ['language', 'cluster']
     clusters.to_csv('clusters.csv', index=False)
@@ -92,22 +129,27 @@ def compute_full_louvain(G):
     return partition
 
 
-def full_betweenness(G):
-    print("Computing full betweenness centrality...")
-    dist = {(u, v): 1.0 / d['weight'] for u, v, d in G.edges(data=True)}
-    dist.update({(v, u): w for (u, v), w in dist.items()})
-    bc = nx.betweenness_centrality(G, weight=lambda u, v, d: dist[(u, v)], normalized=True)
-    bc_df = pd.DataFrame(bc.items(), columns=['language', 'betweenness']).sort_values('betweenness', ascending=False)
+def full_betweenness(G, workers=1, samples=None, simultaneous=False):
+    if samples:
+        print(f"Estimating betweenness centrality from {samples} pivots...")
+        bc_df = approximate_betweenness(G, samples, workers=workers, simultaneous=simultaneous)
+        bc = dict(zip(bc_df['language'], bc_df['betweenness']))
+    else:
+        print("Computing full betweenness centrality...")
+        bc = betweenness_centrality(G, workers=workers)
+        bc_df = pd.DataFrame(bc.items(), columns=['language', 'betweenness'])
+    bc_df = bc_df.sort_values('betweenness', ascending=False)
     bc_df.to_csv('betweenness.csv', index=False)
     print("Saved betweenness centrality to betweenness.csv")
     return bc
 
 
-def node_metrics_csv(G, wdeg_df, bc):
-    # Ensure all graph nodes are included
+def node_metrics_csv(G, wdeg_df, bc, languages=None):
+    # Ensure all graph nodes are included (or every language in `languages`,
+    # e.g. the ones a backbone cut off entirely)
     bc_series = pd.Series(bc, name='betweenness')
     wdeg_series = pd.Series(wdeg_df.set_index('language')['weighted_degree'], name='weighted_degree')
-    nodes = pd.DataFrame({'language': list(G.nodes())})
+    nodes = pd.DataFrame({'language': list(G.nodes()) if languages is None else list(languages)})
     metrics = nodes.set_index('language').join(wdeg_series).join(bc_series).reset_index()
     # fill missing with zeros
     metrics[['weighted_degree','betweenness']] = metrics[['weighted_degree','betweenness']].fillna(0)
@@ -119,7 +161,7 @@ def node_metrics_csv(G, wdeg_df, bc):
 
 def visualize_graph(G, partition, wdeg, top_edges=500):
     print("Visualizing full network with top edges and weights...")
-    # Filter to top edges by weight
+    # Filter to top edges by weight (all edges if top_edges is None)
     edges = sorted(G.edges(data=True), key=lambda x: x[2]['weight'], reverse=True)[:top_edges]
     H = nx.Graph()
     for u, v, d in edges:
@@ -161,8 +203,10 @@ def small_language_connectivity(df, wdeg_df):
     small = wdeg_df[wdeg_df['weighted_degree'] <= cutoff]['language']
     result = []
     for lang in small:
-        all_nbrs = set(df[(df.source == lang) | (df.target == lang)]['source'] + df[(df.source == lang) | (df.target == lang)]['target']) - {lang}
-        strong_nbrs = set(df[((df.source == lang) | (df.target == lang)) & (df['count'] >= 10000)]['source'] + df[((df.source == lang) | (df.target == lang)) & (df['count'] >= 10000)]['target']) - {lang}
+        touching = df[(df.source == lang) | (df.target == lang)]
+        strong = touching[touching['count'] >= 10000]
+        all_nbrs = (set(touching['source']) | set(touching['target'])) - {lang}
+        strong_nbrs = (set(strong['source']) | set(strong['target'])) - {lang}
         result.append({'language': lang, 'num_neighbors_all': len(all_nbrs), 'num_strong_neighbors': len(strong_nbrs)})
     slc_df = pd.DataFrame(result).sort_values('num_neighbors_all')
     slc_df.to_csv('small_language_connectivity.csv', index=False)
@@ -171,6 +215,42 @@ def small_language_connectivity(df, wdeg_df):
     return slc_df
 
 
+def translation_flow_analysis(df, workers=1):
+    nodes, A = flow_matrix(df)
+    print(f"Directed graph: {len(nodes)} nodes, {A.nnz} edges")
+    print(f"Reciprocated share of translation volume: {network_reciprocity(A):.4f}")
+
+    strengths = flow_strengths(nodes, A)
+    strengths.to_csv('flow_strength.csv', index=False)
+    print("Saved in/out strength and net flow to flow_strength.csv")
+
+    corridors = corridor_asymmetry(nodes, A)
+    corridors.to_csv('corridor_asymmetry.csv', index=False)
+    print("Saved per-corridor reciprocity and asymmetry to corridor_asymmetry.csv")
+    print("Most asymmetric of the top 100 corridors:")
+    top = corridors.head(100)
+    print(top.reindex(top['asymmetry'].abs().sort_values(ascending=False).index).head(10).to_string(index=False))
+
+    matrix = asymmetry_matrix(nodes, A)
+    matrix.to_csv('asymmetry_matrix.csv')
+    print(f"Saved {len(nodes)}x{len(nodes)} asymmetry matrix to asymmetry_matrix.csv")
+    plt.figure(figsize=(14, 12))
+    plt.imshow(matrix.values, cmap='RdBu_r', vmin=-1, vmax=1)
+    plt.colorbar(label='(w_ij - w_ji) / (w_ij + w_ji)')
+    plt.xticks(range(len(nodes)), nodes, rotation=90, fontsize=5)
+    plt.yticks(range(len(nodes)), nodes, fontsize=5)
+    plt.title("Translation flow asymmetry (row -> column)")
+    plt.tight_layout()
+    plt.savefig('asymmetry_matrix.png', dpi=200)
+    print("Saved asymmetry heatmap to asymmetry_matrix.png")
+    plt.show()
+
+    metrics = directed_centralities(nodes, A, workers=workers)
+    metrics.to_csv('nodes_metrics_directed.csv', index=False)
+    print("Saved directed node metrics to nodes_metrics_directed.csv")
+    return metrics
+
+
 def extract_colonial_edges(df):
     patterns = ['af', 'sn', 'cm', 'ml', 'ht', 'cd']
     colonial = df[(df.source == 'fr') & df.target.str.startswith(tuple(patterns))]
@@ -181,21 +261,57 @@ def extract_colonial_edges(df):
 def main():
     parser = argparse.ArgumentParser(description="Analyze translation network from OpenSubtitles pair counts")
     parser.add_argument("csv_path", help="Path to opensubtitles_pair_counts.csv")
+    parser.add_argument("--mode", choices=[m for m in MODES if m != 'directed'], default='max',
+                        help="How to combine the two directions of a pair into one corridor weight")
+    parser.add_argument("--sweep", action="store_true",
+                        help="Only sweep all edge-weight cutoffs (components, giant size, join weights) and exit")
+    parser.add_argument("--directed", action="store_true",
+                        help="Only analyse directed translation flow (strengths, asymmetry, directed centralities) and exit")
+    parser.add_argument("--seed", type=int, default=0, help="Louvain random seed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes for betweenness centrality")
+    parser.add_argument("--betweenness-samples", type=int, metavar="K",
+                        help="Estimate betweenness from K pivot nodes (with 95%% confidence bounds) instead of exactly")
+    parser.add_argument("--simultaneous", action="store_true",
+                        help="With --betweenness-samples, make the bounds hold for all languages at once (wider)")
+    parser.add_argument("--backbone", choices=METHODS,
+                        help="Keep statistically significant corridors instead of the fixed weight cutoffs")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Backbone significance level for the full graph")
+    parser.add_argument("--core-alpha", type=float,
+                        help="Backbone significance level for the core graph, whose giant component replaces "
+                             f"the 1e7 cutoff (default per method: {CORE_ALPHA})")
     args = parser.parse_args()
 
     df = load_data(args.csv_path)
+    if args.sweep:
+        connectivity_sweep(df, mode=args.mode)
+        return
+    if args.directed:
+        translation_flow_analysis(df, workers=args.workers)
+        return
     summary_statistics(df)
     top_translation_corridors(df, top_n=10)
     wdeg_df = weighted_degree(df)
-    H = thresholded_subgraph(df, threshold=1e7)
+    if args.backbone:
+        core_alpha = args.core_alpha if args.core_alpha is not None else CORE_ALPHA[args.backbone]
+        H = thresholded_subgraph(df, threshold=1, mode=args.mode, backbone=args.backbone, alpha=core_alpha,
+                                 giant=True)
+    else:
+        H = thresholded_subgraph(df, threshold=1e7, mode=args.mode)
     quick_betweenness(H)
     extract_colonial_edges(df)
-    G = build_full_graph(df, min_weight=1000)
-    partition = compute_full_louvain(G)
-    bc = full_betweenness(G)
-    node_metrics_csv(G, wdeg_df, bc)
+    if args.backbone:
+        G = build_full_graph(df, min_weight=1, mode=args.mode, backbone=args.backbone, alpha=args.alpha)
+    else:
+        G = build_full_graph(df, min_weight=1000, mode=args.mode)
+    partition = compute_full_louvain(G, seed=args.seed)
+    bc = full_betweenness(G, workers=args.workers, samples=args.betweenness_samples,
+                          simultaneous=args.simultaneous)
+    # the backbone can isolate languages; keep them in the table, not in G
+    node_metrics_csv(G, wdeg_df, bc, languages=wdeg_df['language'] if args.backbone else None)
     wdeg_map = dict(zip(wdeg_df['language'], wdeg_df['weighted_degree']))
-    visualize_graph(G, partition, wdeg_map, top_edges=500)
+    # the backbone is already sparse enough to draw in full
+    visualize_graph(G, partition, wdeg_map, top_edges=None if args.backbone else 500)
     small_language_connectivity(df, wdeg_df)
 
 
@@ -1,55 +1,630 @@
-import os
-import re
-import csv
-from collections import defaultdict
-from itertools import combinations
-
-DUMPS_DIR = "datasets"
-OUTPUT_DIRECTED_CSV = "language_network_directed.csv"
-OUTPUT_UNDIRECTED_CSV = "language_network_cooccurrence.csv"
-
-pattern = re.compile(r"\((\d+),'([^']+)','[^']+'\)")
-
-directed_edges = defaultdict(int)
-undirected_edges = defaultdict(int)
-
-for filename in os.listdir(DUMPS_DIR):
-    if not filename.endswith("langlinks.sql"):
-        continue
-
-    match = re.match(r"^(\w{2,})wiki-", filename)
-    if not match:
-        continue
-    source_lang = match.group(1)
-
-    print(f"Processing: {filename} (source={source_lang})")
-
-    with open(os.path.join(DUMPS_DIR, filename), 'r', encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            if line.startswith("INSERT INTO"):
-                matches = pattern.findall(line)
-                page_links = defaultdict(set)
-                for page_id, target_lang in matches:
-                    page_links[page_id].add(target_lang)
-
-                for langs in page_links.values():
-                    for target_lang in langs:
-                        directed_edges[(source_lang, target_lang)] += 1
-
-                    for lang1, lang2 in combinations(sorted(langs), 2):
-                        undirected_edges[frozenset((lang1, lang2))] += 1
-
-# Save directed edges
-with open(OUTPUT_DIRECTED_CSV, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.writer(f)
-    writer.writerow(['source', 'target', 'weight'])
-    for (src, tgt), weight in directed_edges.items():
-        writer.writerow([src, tgt, weight])
-
-# Save undirected co-occurrence edges
-with open(OUTPUT_UNDIRECTED_CSV, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.writer(f)
-    writer.writerow(['lang1', 'lang2', 'weight'])
-    for langs, weight in undirected_edges.items():
-        lang1, lang2 = sorted(langs)
-        writer.writerow([lang1, lang2, weight])
+import os
+import re
+import csv
+import gzip
+import json
+import mmap
+import hashlib
+import tempfile
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+from scipy import sparse
+
+from network_store import write_network
+
+DUMPS_DIR = "datasets"
+OUTPUT_DIRECTED_CSV = "language_network_directed.csv"
+OUTPUT_UNDIRECTED_CSV = "language_network_cooccurrence.csv"
+OUTPUT_COLUMNAR_DIR = "language_network"
+OUTPUT_DIRECTED_DIFF_CSV = "language_network_directed_diff.csv"
+OUTPUT_UNDIRECTED_DIFF_CSV = "language_network_cooccurrence_diff.csv"
+CACHE_DIR = "langlinks_cache"
+RUN_MEMORY = 1024  # MiB for in-memory page-id runs, shared by all workers
+ID_BYTES = 16  # per held page id: the scanned chunks plus their concatenated run
+MANIFEST_FILE = "manifest.json"
+
+BLOCK_SIZE = 16 * 1024 * 1024
+
+# Only the (ll_from, ll_lang) prefix of each row is matched; the title that
+# follows is never read. Quotes inside titles are escaped (\') so a title can't
+# fake a row prefix.
+row_prefix = re.compile(rb"\((\d+),'([^'\\]+)','")
+dump_name = re.compile(r"^(\w{2,})wiki-.*langlinks\.sql(\.gz)?$")
+# page rows start with (page_id, page_namespace, 'page_title', ...
+page_row_prefix = re.compile(rb"\((\d+),(-?\d+),'")
+
+
+def find_dumps(dumps_dir):
+    """Return (path, source_lang) for every langlinks dump, plain or gzipped."""
+    dumps = []
+    for filename in sorted(os.listdir(dumps_dir)):
+        match = dump_name.match(filename)
+        if not match:
+            continue
+        dumps.append((os.path.join(dumps_dir, filename), match.group(1)))
+    return dumps
+
+
+def read_blocks(path, block_size=BLOCK_SIZE):
+    """Yield (buffer, start, end) spans of whole lines from a dump.
+
+    Plain dumps are memory-mapped and scanned in place; .sql.gz dumps are
+    decompressed block by block, never to disk.
+    """
+    if path.endswith(".gz"):
+        with gzip.open(path, 'rb') as f:
+            while True:
+                block = f.read(block_size)
+                if not block:
+                    break
+                block += f.readline()
+                yield block, 0, len(block)
+        return
+
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                end = mm.find(b"\n", min(start + block_size, size))
+                end = size if end == -1 else end + 1
+                yield mm, start, end
+                start = end
+
+
+class LangTable:
+    """Interns language codes (as raw bytes) to small integer ids."""
+
+    def __init__(self):
+        self.ids = {}
+        self.codes = []
+
+    def intern(self, code):
+        lang_id = self.ids.get(code)
+        if lang_id is None:
+            lang_id = self.ids[code] = len(self.codes)
+            self.codes.append(code.decode('ascii', errors='replace'))
+        return lang_id
+
+
+def scan_pairs(path, langs):
+    """Yield batches of (page_ids, lang_ids) arrays from a langlinks dump.
+
+    Works directly on bytes: titles are skipped, nothing is decoded, and
+    language codes are interned through `langs`.
+    """
+    for buf, start, end in read_blocks(path):
+        rows = row_prefix.findall(buf, start, end)
+        if not rows:
+            continue
+        page_ids, codes = zip(*rows)
+        yield (np.array(page_ids).astype(np.int64),
+               np.fromiter(map(langs.intern, codes), dtype=np.uint16, count=len(codes)))
+
+
+def scan_article_ids(page_path):
+    """Yield arrays of namespace-0 page ids from an edition's page.sql(.gz) dump."""
+    for buf, start, end in read_blocks(page_path):
+        rows = page_row_prefix.findall(buf, start, end)
+        if not rows:
+            continue
+        page_ids, namespaces = zip(*rows)
+        page_ids = np.array(page_ids).astype(np.int64)
+        yield page_ids[np.array(namespaces).astype(np.int64) == 0]
+
+
+def run_size_for(run_memory=RUN_MEMORY, workers=1):
+    """Page ids each worker may hold before spilling, for a `run_memory` MiB budget."""
+    return max(1_000_000, run_memory * 2 ** 20 // (ID_BYTES * max(workers, 1)))
+
+
+RUN_SIZE = run_size_for()
+
+
+def sorted_article_ids(page_path, run_size=RUN_SIZE):
+    """Yield the namespace-0 page ids of a page dump as ascending arrays.
+
+    Ids are sorted in runs of at most `run_size`; if the dump needs more than
+    one run, each run is spilled to disk and the runs are merged back block by
+    block, so memory stays bounded whatever the size of the page table.
+    """
+    with tempfile.TemporaryDirectory(prefix="langlinks_runs_") as tmp_dir:
+        runs, pending, held = [], [], 0
+        for ids in scan_article_ids(page_path):
+            pending.append(ids)
+            held += len(ids)
+            if held >= run_size:
+                runs.append(_spill_run(tmp_dir, len(runs), pending))
+                pending, held = [], 0
+
+        if not runs:
+            if pending:
+                yield _sorted_run(pending)
+            return
+        if pending:
+            runs.append(_spill_run(tmp_dir, len(runs), pending))
+        yield from _merge_runs([np.load(run, mmap_mode='r') for run in runs])
+
+
+def _sorted_run(chunks):
+    # chunks are dropped as soon as they are copied and the sort is in place,
+    # so at most two copies of the ids are alive (ID_BYTES)
+    run = np.concatenate(chunks)
+    chunks.clear()
+    run.sort()
+    return run
+
+
+def _spill_run(tmp_dir, index, chunks):
+    path = os.path.join(tmp_dir, f"run{index}.npy")
+    np.save(path, _sorted_run(chunks))
+    return path
+
+
+def _merge_runs(runs, block_size=1_000_000):
+    # k-way merge a block at a time: everything up to the smallest block tail
+    # seen across the runs is final and can be emitted
+    offsets = [0] * len(runs)
+    buffers = [np.empty(0, dtype=np.int64)] * len(runs)
+    while True:
+        for i, run in enumerate(runs):
+            if not len(buffers[i]) and offsets[i] < len(run):
+                buffers[i] = np.asarray(run[offsets[i]:offsets[i] + block_size])
+                offsets[i] += len(buffers[i])
+        live = [i for i in range(len(runs)) if len(buffers[i])]
+        if not live:
+            return
+        cutoff = min(buffers[i][-1] for i in live)
+        out = []
+        for i in live:
+            split = np.searchsorted(buffers[i], cutoff, side='right')
+            out.append(buffers[i][:split])
+            buffers[i] = buffers[i][split:]
+        yield np.sort(np.concatenate(out))
+
+
+def join_articles(batches, article_blocks):
+    """Sort-merge join of (page_ids, lang_ids) batches with sorted article ids.
+
+    Keeps only rows whose ll_from is a namespace-0 page. Both streams are
+    ascending, so only the article ids up to the current batch are held.
+    """
+    window = np.empty(0, dtype=np.int64)
+    exhausted = False
+    for page_ids, lang_ids in batches:
+        if not len(page_ids):
+            continue
+        last = page_ids[-1]
+        while not exhausted and (not len(window) or window[-1] < last):
+            block = next(article_blocks, None)
+            if block is None:
+                exhausted = True
+            else:
+                window = np.concatenate((window, block))
+        keep = np.isin(page_ids, window[:np.searchsorted(window, last, side='right')])
+        # `last` stays in the window: its rows may continue in the next batch
+        window = window[np.searchsorted(window, last, side='left'):]
+        if keep.any():
+            yield page_ids[keep], lang_ids[keep]
+
+
+def dump_batches(path, langs, page_dump=None, run_size=RUN_SIZE):
+    """scan_pairs, restricted to main-namespace pages when a page dump is given."""
+    batches = scan_pairs(path, langs)
+    if page_dump:
+        batches = join_articles(batches, sorted_article_ids(page_dump, run_size))
+    return batches
+
+
+def find_page_dump(path):
+    """The page.sql(.gz) dump that goes with a langlinks dump of the same edition and date."""
+    base = re.sub(r"langlinks\.sql(\.gz)?$", "page.sql", path)
+    for candidate in (base + ".gz", base):
+        if os.path.exists(candidate):
+            return candidate
+    raise FileNotFoundError(f"No page dump found next to {path} (expected {base}[.gz])")
+
+
+def iter_pages(batches):
+    """Group (page_ids, lang_ids) batches into one language-id set per page.
+
+    Dumps are ordered by ll_from, so only the current page's set is held; it
+    is flushed when the page id changes, however the page was split across
+    INSERT lines or blocks.
+    """
+    current_page = None
+    current_langs = set()
+    for page_ids, lang_ids in batches:
+        bounds = np.flatnonzero(np.diff(page_ids)) + 1
+        starts = [0] + bounds.tolist()
+        for start, run in zip(starts, np.split(lang_ids, bounds)):
+            page_id = int(page_ids[start])
+            if page_id != current_page:
+                if current_langs:
+                    yield current_page, current_langs
+                current_page, current_langs = page_id, set()
+            current_langs.update(run.tolist())
+    if current_langs:
+        yield current_page, current_langs
+
+
+def process_dump(path, source_lang, page_dump=None, run_size=RUN_SIZE):
+    """Parse one dump and return its partial (directed, undirected) edge tables."""
+    directed_edges = defaultdict(int)
+    undirected_edges = defaultdict(int)
+    langs = LangTable()
+
+    for _, lang_ids in iter_pages(dump_batches(path, langs, page_dump, run_size)):
+        page_langs = [langs.codes[i] for i in lang_ids]
+        for target_lang in page_langs:
+            directed_edges[(source_lang, target_lang)] += 1
+
+        for lang1, lang2 in combinations(sorted(page_langs), 2):
+            undirected_edges[(lang1, lang2)] += 1
+
+    return dict(directed_edges), dict(undirected_edges)
+
+
+def iter_incidence(batches, langs):
+    """Yield binary page x language CSR matrices, one per batch.
+
+    The last page of a batch may continue in the next one, so its rows are
+    carried over rather than emitted as a separate page.
+    """
+    carry_pages = np.empty(0, dtype=np.int64)
+    carry_langs = np.empty(0, dtype=np.uint16)
+    for page_ids, lang_ids in batches:
+        page_ids = np.concatenate((carry_pages, page_ids))
+        lang_ids = np.concatenate((carry_langs, lang_ids))
+        bounds = np.flatnonzero(np.diff(page_ids)) + 1
+        cut = bounds[-1] if len(bounds) else 0
+        carry_pages, carry_langs = page_ids[cut:], lang_ids[cut:]
+        if cut:
+            yield _incidence(page_ids[:cut], lang_ids[:cut], len(langs.codes))
+    if len(carry_pages):
+        yield _incidence(carry_pages, carry_langs, len(langs.codes))
+
+
+def _incidence(page_ids, lang_ids, n_langs):
+    rows = np.concatenate(([0], np.cumsum(np.diff(page_ids) != 0)))
+    A = sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, lang_ids)),
+                          shape=(rows[-1] + 1, n_langs))
+    A.data[:] = 1  # a page links to each language at most once
+    return A
+
+
+def process_dump_sparse(path, source_lang, page_dump=None, run_size=RUN_SIZE):
+    """Same tables as process_dump, computed as the sparse product A.T @ A.
+
+    Off-diagonal entries are co-occurrence counts; the diagonal counts the
+    pages linking to each language, i.e. the directed edges from source_lang.
+    """
+    langs = LangTable()
+    cooc = sparse.csr_matrix((0, 0), dtype=np.int64)
+
+    for A in iter_incidence(dump_batches(path, langs, page_dump, run_size), langs):
+        n_langs = A.shape[1]
+        cooc.resize((n_langs, n_langs))
+        cooc = cooc + (A.T @ A)
+
+    counts = cooc.diagonal()
+    directed_edges = {(source_lang, langs.codes[i]): int(counts[i]) for i in np.flatnonzero(counts)}
+
+    pairs = sparse.triu(cooc, k=1).tocoo()
+    undirected_edges = {}
+    for i, j, weight in zip(pairs.row.tolist(), pairs.col.tolist(), pairs.data.tolist()):
+        lang1, lang2 = sorted((langs.codes[i], langs.codes[j]))
+        undirected_edges[(lang1, lang2)] = weight
+
+    return directed_edges, undirected_edges
+
+
+ENGINES = {
+    'python': process_dump,
+    'sparse': process_dump_sparse,
+}
+
+
+def _process_dump_task(task):
+    path, source_lang, engine, page_dump, run_size = task
+    print(f"Processing: {os.path.basename(path)} (source={source_lang})")
+    return ENGINES[engine](path, source_lang, page_dump, run_size)
+
+
+def merge_partials(partials):
+    directed_edges = defaultdict(int)
+    undirected_edges = defaultdict(int)
+    for directed, undirected in partials:
+        for edge, weight in directed.items():
+            directed_edges[edge] += weight
+        for edge, weight in undirected.items():
+            undirected_edges[edge] += weight
+    return directed_edges, undirected_edges
+
+
+def _tasks(dumps, engine, main_namespace, run_size=RUN_SIZE):
+    return [(path, source_lang, engine, find_page_dump(path) if main_namespace else None, run_size)
+            for path, source_lang in dumps]
+
+
+def build_network(dumps, workers=1, engine='sparse', main_namespace=False, run_memory=RUN_MEMORY):
+    """Parse all dumps, one file per task, and merge the partial edge tables."""
+    run_size = run_size_for(run_memory, min(workers, len(dumps)))
+    tasks = _tasks(dumps, engine, main_namespace, run_size)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = pool.map(_process_dump_task, tasks)
+            return merge_partials(partials)
+    return merge_partials(map(_process_dump_task, tasks))
+
+
+def iter_page_langs(path):
+    """Yield (page_id, frozenset of language codes) for each page of a dump, in ll_from order."""
+    langs = LangTable()
+    for page_id, lang_ids in iter_pages(scan_pairs(path, langs)):
+        yield page_id, frozenset(langs.codes[i] for i in lang_ids)
+
+
+def diff_snapshots(old_path, new_path, source_lang):
+    """Per-edge link deltas between two snapshots of the same edition.
+
+    Both dumps are ordered by ll_from, so they are merge-joined page by page
+    and only the delta tables are held in memory. A page that exists in one
+    snapshot only counts as entirely added (or removed).
+    """
+    directed = defaultdict(lambda: [0, 0])
+    undirected = defaultdict(lambda: [0, 0])
+    ADDED, REMOVED = 0, 1
+
+    def record(before, after):
+        for target_lang in after - before:
+            directed[(source_lang, target_lang)][ADDED] += 1
+        for target_lang in before - after:
+            directed[(source_lang, target_lang)][REMOVED] += 1
+        old_pairs = set(combinations(sorted(before), 2))
+        new_pairs = set(combinations(sorted(after), 2))
+        for pair in new_pairs - old_pairs:
+            undirected[pair][ADDED] += 1
+        for pair in old_pairs - new_pairs:
+            undirected[pair][REMOVED] += 1
+
+    empty = frozenset()
+    old_pages, new_pages = iter_page_langs(old_path), iter_page_langs(new_path)
+    old, new = next(old_pages, None), next(new_pages, None)
+    while old is not None or new is not None:
+        if new is None or (old is not None and old[0] < new[0]):
+            record(old[1], empty)
+            old = next(old_pages, None)
+        elif old is None or new[0] < old[0]:
+            record(empty, new[1])
+            new = next(new_pages, None)
+        else:
+            if old[1] != new[1]:
+                record(old[1], new[1])
+            old, new = next(old_pages, None), next(new_pages, None)
+
+    return dict(directed), dict(undirected)
+
+
+def write_diff(directed, undirected,
+               directed_csv=OUTPUT_DIRECTED_DIFF_CSV, undirected_csv=OUTPUT_UNDIRECTED_DIFF_CSV):
+    with open(directed_csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['source', 'target', 'added', 'removed', 'net'])
+        for (src, tgt), (added, removed) in sorted(directed.items()):
+            writer.writerow([src, tgt, added, removed, added - removed])
+
+    with open(undirected_csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['lang1', 'lang2', 'added', 'removed', 'net'])
+        for (lang1, lang2), (added, removed) in sorted(undirected.items()):
+            writer.writerow([lang1, lang2, added, removed, added - removed])
+
+
+def file_checksum(path, chunk_size=BLOCK_SIZE):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(cache_dir):
+    path = os.path.join(cache_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(cache_dir, manifest):
+    # write-then-rename so an interrupted run never leaves a torn manifest
+    path = os.path.join(cache_dir, MANIFEST_FILE)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def save_partial(path, directed, undirected):
+    np.savez(path,
+             directed_source=np.array([src for src, _ in directed], dtype=str),
+             directed_target=np.array([tgt for _, tgt in directed], dtype=str),
+             directed_weight=np.array(list(directed.values()), dtype=np.int64),
+             lang1=np.array([lang1 for lang1, _ in undirected], dtype=str),
+             lang2=np.array([lang2 for _, lang2 in undirected], dtype=str),
+             weight=np.array(list(undirected.values()), dtype=np.int64))
+
+
+def load_partial(path):
+    with np.load(path) as data:
+        directed = dict(zip(zip(data['directed_source'].tolist(), data['directed_target'].tolist()),
+                            data['directed_weight'].tolist()))
+        undirected = dict(zip(zip(data['lang1'].tolist(), data['lang2'].tolist()),
+                              data['weight'].tolist()))
+    return directed, undirected
+
+
+def fingerprint(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime': stat.st_mtime, 'sha256': file_checksum(path)}
+
+
+def is_unchanged(record, path):
+    """True if a fingerprint record (size, mtime, sha256) still describes `path`.
+
+    Size and mtime are checked first; if only the mtime moved (a re-download
+    or touch), the checksum decides and the record takes the new mtime.
+    """
+    stat = os.stat(path)
+    if stat.st_size != record['size']:
+        return False
+    if stat.st_mtime == record['mtime']:
+        return True
+    if file_checksum(path) == record['sha256']:
+        record['mtime'] = stat.st_mtime
+        return True
+    return False
+
+
+def is_cached(entry, path, cache_dir, page_dump=None):
+    """True if the manifest entry still describes the dump at `path` and its page dump."""
+    if not entry or not os.path.exists(os.path.join(cache_dir, entry['partial'])):
+        return False
+    recorded = entry.get('page_dump')
+    if page_dump:
+        # entries from before page dumps were fingerprinted hold a bare name
+        if not isinstance(recorded, dict) or recorded['name'] != os.path.basename(page_dump):
+            return False
+        if not is_unchanged(recorded, page_dump):
+            return False
+    elif recorded:
+        return False
+    return is_unchanged(entry, path)
+
+
+def _refresh_dump_task(task):
+    path, source_lang, engine, page_dump, _ = task
+    partial = _process_dump_task(task)
+    entry = {'source': source_lang, **fingerprint(path),
+             'page_dump': page_dump and {'name': os.path.basename(page_dump), **fingerprint(page_dump)}}
+    return entry, partial
+
+
+def build_network_incremental(dumps, cache_dir=CACHE_DIR, workers=1, engine='sparse', main_namespace=False,
+                              run_memory=RUN_MEMORY):
+    """Like build_network, but only parses dumps that are new or changed.
+
+    Each dump's partial edge table is kept in `cache_dir` and recorded in a
+    manifest keyed by file name, size, mtime and checksum (and the same for the
+    page dump with main_namespace); unchanged dumps are re-merged from there.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest = load_manifest(cache_dir)
+    current = {os.path.basename(path) for path, _ in dumps}
+    for filename in set(manifest) - current:
+        stale = os.path.join(cache_dir, manifest.pop(filename)['partial'])
+        if os.path.exists(stale):
+            os.remove(stale)
+
+    tasks = []
+    for task in _tasks(dumps, engine, main_namespace):
+        path, source_lang, _, page_dump, _ = task
+        if is_cached(manifest.get(os.path.basename(path)), path, cache_dir, page_dump):
+            print(f"Cached: {os.path.basename(path)} (source={source_lang})")
+        else:
+            tasks.append(task)
+    run_size = run_size_for(run_memory, min(workers, len(tasks)))
+    tasks = [task[:4] + (run_size,) for task in tasks]
+
+    def refresh(results):
+        for (path, *_), (entry, partial) in zip(tasks, results):
+            filename = os.path.basename(path)
+            entry['partial'] = filename + ".npz"
+            save_partial(os.path.join(cache_dir, entry['partial']), *partial)
+            manifest[filename] = entry
+            save_manifest(cache_dir, manifest)
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            refresh(pool.map(_refresh_dump_task, tasks))
+    else:
+        refresh(map(_refresh_dump_task, tasks))
+    save_manifest(cache_dir, manifest)
+
+    print(f"Parsed {len(tasks)} of {len(dumps)} dumps, merging cached partials")
+    partials = (load_partial(os.path.join(cache_dir, manifest[os.path.basename(path)]['partial']))
+                for path, _ in dumps)
+    return merge_partials(partials)
+
+
+def write_edges(directed_edges, undirected_edges,
+                directed_csv=OUTPUT_DIRECTED_CSV, undirected_csv=OUTPUT_UNDIRECTED_CSV):
+    # Save directed edges
+    with open(directed_csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['source', 'target', 'weight'])
+        for (src, tgt), weight in directed_edges.items():
+            writer.writerow([src, tgt, weight])
+
+    # Save undirected co-occurrence edges
+    with open(undirected_csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['lang1', 'lang2', 'weight'])
+        for (lang1, lang2), weight in undirected_edges.items():
+            writer.writerow([lang1, lang2, weight])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Wikipedia language network from langlinks dumps")
+    parser.add_argument("--dumps-dir", default=DUMPS_DIR, help="Directory holding *wiki-*langlinks.sql(.gz) dumps")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (1 = sequential)")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default='sparse',
+                        help="Pair counting: per-page Python loops or a sparse A.T @ A product")
+    parser.add_argument("--cache-dir", default=CACHE_DIR,
+                        help="Where per-dump partial results and their manifest are kept")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse every dump and ignore the manifest")
+    parser.add_argument("--main-namespace", action="store_true",
+                        help="Only count articles (namespace 0), joining each dump with its edition's page.sql(.gz)")
+    parser.add_argument("--run-memory", type=int, default=RUN_MEMORY, metavar="MIB",
+                        help="Memory for sorting page ids with --main-namespace, split across the workers")
+    parser.add_argument("--columnar", default=OUTPUT_COLUMNAR_DIR,
+                        help="Directory for the memory-mappable .npy copy of both edge tables ('' to skip)")
+    parser.add_argument("--diff", nargs=2, metavar=("OLD_DUMP", "NEW_DUMP"),
+                        help="Compare two snapshots of one edition and write per-edge deltas instead")
+    args = parser.parse_args()
+
+    if args.diff:
+        old_path, new_path = args.diff
+        editions = [dump_name.match(os.path.basename(path)) for path in args.diff]
+        if not all(editions) or editions[0].group(1) != editions[1].group(1):
+            raise ValueError("--diff expects two langlinks dumps of the same edition")
+        directed, undirected = diff_snapshots(old_path, new_path, editions[0].group(1))
+        write_diff(directed, undirected)
+        print(f"Diffed {os.path.basename(old_path)} -> {os.path.basename(new_path)}: "
+              f"{len(directed)} directed, {len(undirected)} co-occurrence edges changed")
+        return
+
+    dumps = find_dumps(args.dumps_dir)
+    if args.no_cache:
+        directed_edges, undirected_edges = build_network(
+            dumps, workers=args.workers, engine=args.engine, main_namespace=args.main_namespace,
+            run_memory=args.run_memory)
+    else:
+        directed_edges, undirected_edges = build_network_incremental(
+            dumps, cache_dir=args.cache_dir, workers=args.workers, engine=args.engine,
+            main_namespace=args.main_namespace, run_memory=args.run_memory)
+    write_edges(directed_edges, undirected_edges)
+    if args.columnar:
+        write_network(args.columnar, directed_edges, undirected_edges)
+    print(f"Merged {len(dumps)} dumps: {len(directed_edges)} directed, {len(undirected_edges)} co-occurrence edges")
+
+
+if __name__ == "__main__":
+    main()
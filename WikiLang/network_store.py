@@ -0,0 +1,65 @@
+"""
+network_store.py
+
+Columnar storage for the Wikipedia language network written by langlinks.py.
+
+A store is a directory of plain .npy files, so every column can be opened
+with np.load(mmap_mode='r') without parsing or copying:
+
+    codes.npy                    interned language codes (index = language id)
+    directed_source.npy          \
+    directed_target.npy           > one row per directed edge
+    directed_weight.npy          /
+    cooccurrence_lang1.npy       \
+    cooccurrence_lang2.npy        > one row per co-occurrence edge
+    cooccurrence_weight.npy      /
+"""
+import os
+from collections import namedtuple
+
+import numpy as np
+
+EdgeArrays = namedtuple('EdgeArrays', ['source', 'target', 'weight'])
+LanguageNetwork = namedtuple('LanguageNetwork', ['codes', 'directed', 'cooccurrence'])
+
+
+def _edge_arrays(edges, ids, id_dtype):
+    source = np.fromiter((ids[a] for a, _ in edges), dtype=id_dtype, count=len(edges))
+    target = np.fromiter((ids[b] for _, b in edges), dtype=id_dtype, count=len(edges))
+    weight = np.fromiter(edges.values(), dtype=np.int64, count=len(edges))
+    return EdgeArrays(source, target, weight)
+
+
+def write_network(path, directed_edges, undirected_edges):
+    """Write {(lang, lang): weight} edge tables as a columnar store at `path`."""
+    codes = sorted({lang for edges in (directed_edges, undirected_edges) for pair in edges for lang in pair})
+    ids = {code: i for i, code in enumerate(codes)}
+    id_dtype = np.uint16 if len(codes) <= np.iinfo(np.uint16).max else np.uint32
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, 'codes.npy'), np.array(codes, dtype=str))
+    for name, edges in (('directed', directed_edges), ('cooccurrence', undirected_edges)):
+        arrays = _edge_arrays(edges, ids, id_dtype)
+        labels = ('source', 'target') if name == 'directed' else ('lang1', 'lang2')
+        for label, column in zip(labels + ('weight',), arrays):
+            np.save(os.path.join(path, f"{name}_{label}.npy"), column)
+
+
+def load_network(path, mmap=True):
+    """Load a store written by write_network.
+
+    Returns a LanguageNetwork whose `directed` and `cooccurrence` fields are
+    (source, target, weight) integer arrays indexing into `codes`. With
+    mmap=True the arrays are memory-mapped read-only rather than read.
+    """
+    mode = 'r' if mmap else None
+
+    def column(name):
+        return np.load(os.path.join(path, name + '.npy'), mmap_mode=mode)
+
+    return LanguageNetwork(
+        codes=column('codes'),
+        directed=EdgeArrays(column('directed_source'), column('directed_target'), column('directed_weight')),
+        cooccurrence=EdgeArrays(column('cooccurrence_lang1'), column('cooccurrence_lang2'),
+                                column('cooccurrence_weight')),
+    )
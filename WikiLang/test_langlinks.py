@@ -0,0 +1,88 @@
+import functools
+
+import numpy as np
+
+import langlinks
+from langlinks import LangTable, join_articles, process_dump_sparse, scan_article_ids, scan_pairs
+
+
+def _in_memory_join(path, page_dump, langs):
+    """Reference for join_articles: every article id held at once."""
+    articles = np.concatenate(list(scan_article_ids(page_dump)))
+    for page_ids, lang_ids in scan_pairs(path, langs):
+        keep = np.isin(page_ids, articles)
+        if keep.any():
+            yield page_ids[keep], lang_ids[keep]
+
+
+def _write_dumps(tmp_path, rng, n_pages=300):
+    page_ids = np.arange(1, n_pages + 1)
+    namespaces = rng.choice([0, 0, 1, 4], size=n_pages)
+    codes = ['de', 'fr', 'es', 'it', 'ja', 'nl', 'pl', 'ru']
+    page_rows = [f"({p},{ns},'Page_{p}',0)" for p, ns in zip(page_ids, namespaces)]
+    link_rows = [f"({p},'{code}','Title {p}')"
+                 for p in page_ids for code in rng.choice(codes, size=rng.integers(0, 6), replace=False)]
+    langlinks_dump = tmp_path / "enwiki-20240101-langlinks.sql"
+    page_dump = tmp_path / "enwiki-20240101-page.sql"
+    # a few rows per INSERT line, so pages are split across lines and blocks
+    langlinks_dump.write_text("".join(f"INSERT INTO `langlinks` VALUES {','.join(link_rows[i:i + 7])};\n"
+                                      for i in range(0, len(link_rows), 7)))
+    page_dump.write_text("".join(f"INSERT INTO `page` VALUES {','.join(page_rows[i:i + 5])};\n"
+                                 for i in range(0, len(page_rows), 5)))
+    return str(langlinks_dump), str(page_dump)
+
+
+def test_join_keeps_page_continued_in_next_batch():
+    batches = [(np.array([1, 2, 5]), np.array([0, 1, 2], dtype=np.uint16)),
+               (np.array([5, 5, 6]), np.array([3, 4, 5], dtype=np.uint16))]
+    joined = list(join_articles(iter(batches), iter([np.array([1, 5, 6])])))
+    page_ids = np.concatenate([p for p, _ in joined])
+    lang_ids = np.concatenate([l for _, l in joined])
+    assert page_ids.tolist() == [1, 5, 5, 5, 6]
+    assert lang_ids.tolist() == [0, 2, 3, 4, 5]
+
+
+def test_join_matches_in_memory_join(tmp_path, monkeypatch):
+    path, page_dump = _write_dumps(tmp_path, np.random.default_rng(0))
+    monkeypatch.setattr(langlinks, 'read_blocks', functools.partial(langlinks.read_blocks, block_size=64))
+
+    expected_langs, langs = LangTable(), LangTable()
+    expected = list(_in_memory_join(path, page_dump, expected_langs))
+    joined = list(langlinks.dump_batches(path, langs, page_dump))
+    assert np.array_equal(np.concatenate([p for p, _ in joined]), np.concatenate([p for p, _ in expected]))
+    assert langs.codes == expected_langs.codes
+    assert np.array_equal(np.concatenate([l for _, l in joined]), np.concatenate([l for _, l in expected]))
+
+
+def test_main_namespace_counts_independent_of_block_size(tmp_path, monkeypatch):
+    path, page_dump = _write_dumps(tmp_path, np.random.default_rng(1))
+    expected = process_dump_sparse(path, 'en', page_dump)
+    monkeypatch.setattr(langlinks, 'read_blocks', functools.partial(langlinks.read_blocks, block_size=64))
+    assert process_dump_sparse(path, 'en', page_dump) == expected
+
+
+def test_incremental_reparses_when_page_dump_changes(tmp_path):
+    path, page_dump = _write_dumps(tmp_path, np.random.default_rng(2))
+    dumps = langlinks.find_dumps(str(tmp_path))
+    cache_dir = str(tmp_path / "cache")
+    langlinks.build_network_incremental(dumps, cache_dir=cache_dir, main_namespace=True)
+
+    # same file name, new contents: every page moves to the main namespace
+    with open(page_dump) as f:
+        rows = f.read()
+    with open(page_dump, 'w') as f:
+        f.write(rows.replace(",1,'", ",0,'").replace(",4,'", ",0,'"))
+    assert (langlinks.build_network_incremental(dumps, cache_dir=cache_dir, main_namespace=True)
+            == langlinks.build_network(dumps, main_namespace=True))
+
+
+def test_spilled_runs_match_in_memory_sort(tmp_path):
+    _, page_dump = _write_dumps(tmp_path, np.random.default_rng(3))
+    expected = np.sort(np.concatenate(list(scan_article_ids(page_dump))))
+    spilled = np.concatenate(list(langlinks.sorted_article_ids(page_dump, run_size=7)))
+    assert np.array_equal(spilled, expected)
+
+
+def test_run_size_shrinks_with_workers():
+    assert langlinks.run_size_for(1024, 8) * 8 <= langlinks.run_size_for(1024, 1)
+    assert langlinks.run_size_for(1024, 8) * langlinks.ID_BYTES * 8 <= 1024 * 2 ** 20
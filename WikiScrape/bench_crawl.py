@@ -0,0 +1,71 @@
+"""
+bench_crawl.py
+
+Crawl-throughput benchmark for wikiscraper.py against the local fixture
+server. For each concurrency level, runs WrapperSpider (via
+`wikiscraper.py --crawler`) in a fresh process and reports pages/sec, CPU
+time per page and the crawler's peak RSS.
+
+    python bench_crawl.py --pages 500 --concurrency 1 4 16 64 --latency 0.05
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from fixture_server import serve, title_of
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def write_crawler_file(path, base_url, max_pages, concurrency, seeds=4):
+    with open(path, 'w') as f:
+        f.write(f"{max_pages}\n{base_url}\n")
+        f.write(f"concurrency = {concurrency}\n")
+        f.write(f"per_host_concurrency = {concurrency}\n")
+        f.write("delay = 0\n")
+        f.write("autothrottle = no\n")
+        for i in range(seeds):
+            f.write(f"{base_url}/wiki/{title_of(i)}\n")
+
+
+def run_once(crawler_file):
+    """Run one crawl in a child process; return (pages, seconds, cpu_seconds, peak_rss_mb)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(HERE, 'wikiscraper.py'), '--crawler', crawler_file],
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, cwd=HERE)
+    output = proc.stdout.read()
+    _, _, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    pages = sum(1 for line in output.splitlines() if line.startswith('Visited: '))
+    # ru_maxrss is in KiB on Linux
+    return pages, elapsed, usage.ru_utime + usage.ru_stime, usage.ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark wikiscraper.py against the local fixture server")
+    parser.add_argument("--pages", type=int, default=500, help="Pages to crawl per run")
+    parser.add_argument("--corpus-pages", type=int, default=5000, help="Size of the synthetic corpus")
+    parser.add_argument("--concurrency", type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated server latency in seconds")
+    args = parser.parse_args()
+
+    server = serve(pages=args.corpus_pages, latency=args.latency)
+    host, port = server.server_address
+    base_url = f"http://{host}:{port}"
+
+    print(f"{'concurrency':>11} {'pages':>6} {'seconds':>8} {'pages/s':>8} {'cpu ms/page':>12} {'peak RSS MB':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for concurrency in args.concurrency:
+            crawler_file = os.path.join(tmp, f"crawl_{concurrency}.txt")
+            write_crawler_file(crawler_file, base_url, args.pages, concurrency)
+            pages, elapsed, cpu, rss = run_once(crawler_file)
+            print(f"{concurrency:>11} {pages:>6} {elapsed:>8.2f} {pages / elapsed:>8.1f} "
+                  f"{1000 * cpu / max(pages, 1):>12.2f} {rss:>12.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+bench_parse.py
+
+Per-page link-extraction benchmark on the fixture corpus: times the regex
+extractor (extract_links_fast) against the CSS-selector one
+(extract_links_css) that WikipediaLanguageSpider.parse can use, and checks
+that both return the same links.
+
+    python bench_parse.py --pages 300
+"""
+import argparse
+import time
+
+from scrapy.http import HtmlResponse
+
+from fixture_server import render_page, title_of
+from wikiscraper import extract_links_css, extract_links_fast
+
+
+def time_extractor(extract, responses):
+    start = time.perf_counter()
+    results = []
+    for response in responses:
+        lang_links, article_links = extract(response)
+        results.append((lang_links, list(article_links)))
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare link extractors on fixture pages")
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--links", type=int, default=400, help="Internal links per page")
+    parser.add_argument("--paragraphs", type=int, default=60)
+    args = parser.parse_args()
+
+    bodies = [render_page(i, args.pages, links=args.links, paragraphs=args.paragraphs).encode('utf-8')
+              for i in range(args.pages)]
+    # A fresh response per run: parsel caches the parsed DOM on the response
+    def responses():
+        return [HtmlResponse(f"http://127.0.0.1/wiki/{title_of(i)}", body=body, encoding='utf-8')
+                for i, body in enumerate(bodies)]
+
+    css_time, css_results = time_extractor(extract_links_css, responses())
+    fast_time, fast_results = time_extractor(lambda r: extract_links_fast(r.body), responses())
+
+    kib = sum(map(len, bodies)) / len(bodies) / 1024
+    print(f"{args.pages} pages, {kib:.0f} KiB each on average")
+    print(f"css:  {1000 * css_time / args.pages:8.3f} ms/page")
+    print(f"fast: {1000 * fast_time / args.pages:8.3f} ms/page  ({css_time / fast_time:.1f}x)")
+    print(f"identical links: {css_results == fast_results}")
+
+
+if __name__ == "__main__":
+    main()
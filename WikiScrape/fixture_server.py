@@ -0,0 +1,139 @@
+"""
+fixture_server.py
+
+Local stand-in for Wikipedia, for tuning and benchmarking wikiscraper.py
+offline. Serves a deterministic synthetic corpus (or a directory of recorded
+pages) under /wiki/<title>, with Wikipedia-style interlanguage links
+(a[hreflang]) and internal /wiki/ links, and an optional per-response latency.
+
+    python fixture_server.py --port 8000 --pages 5000 --latency 0.05
+"""
+import argparse
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+LANGUAGES = [
+    'ar', 'arz', 'az', 'be', 'bg', 'bn', 'bs', 'ca', 'ce', 'ceb', 'cs', 'cy', 'da', 'de', 'el',
+    'eo', 'es', 'et', 'eu', 'fa', 'fi', 'fr', 'ga', 'gl', 'he', 'hi', 'hr', 'hu', 'hy', 'id',
+    'is', 'it', 'ja', 'ka', 'kk', 'ko', 'la', 'lt', 'lv', 'mk', 'ml', 'mn', 'mr', 'ms', 'my',
+    'nl', 'nn', 'no', 'pa', 'pl', 'pt', 'ro', 'ru', 'sh', 'simple', 'sk', 'sl', 'sq', 'sr',
+    'sv', 'sw', 'ta', 'te', 'tg', 'th', 'tl', 'tr', 'tt', 'uk', 'ur', 'uz', 'vi', 'war', 'yo',
+    'zh', 'zh-min-nan', 'zh-yue', 'af', 'an', 'ast', 'azb', 'ba', 'bar', 'br', 'ckb', 'fy',
+    'gu', 'ht', 'io', 'jv', 'kn', 'ku', 'ky', 'lb', 'lmo', 'mg', 'new', 'oc', 'pms', 'scn',
+]
+
+NAV_LINKS = ['/wiki/Main_Page', '/wiki/Special:Random', '/wiki/Help:Contents',
+             '/wiki/Wikipedia:About', '/wiki/Portal:Current_events']
+
+
+def title_of(i):
+    return f"Article_{i}"
+
+
+def render_page(i, pages, links=40, paragraphs=30, seed=0):
+    """HTML for synthetic article i of a `pages`-article corpus.
+
+    Language counts are heavy-tailed like real articles (most have a few,
+    some have 100+), and the body is padded with prose so that parse cost
+    resembles a long article.
+    """
+    rng = random.Random(seed * 1_000_003 + i)
+    n_langs = min(len(LANGUAGES), int(rng.paretovariate(0.8)))
+    langs = rng.sample(LANGUAGES, n_langs)
+    title = title_of(i)
+
+    body = []
+    for p in range(paragraphs):
+        words = ' '.join(f"word{rng.randrange(5000)}" for _ in range(60))
+        targets = [title_of(rng.randrange(pages)) for _ in range(max(1, links // paragraphs))]
+        anchors = ' '.join(f'<a href="/wiki/{t}" title="{t}">{t}</a>' for t in targets)
+        body.append(f"<p>{words} {anchors} <sup><a href=\"#cite_note-{p}\">[{p}]</a></sup></p>")
+
+    interlanguage = ''.join(
+        f'<li class="interlanguage-link interwiki-{lang} mw-list-item">'
+        f'<a href="https://{lang}.wikipedia.org/wiki/{title}" title="{title} – {lang}" '
+        f'lang="{lang}" hreflang="{lang}" class="interlanguage-link-target">{lang}</a></li>'
+        for lang in langs)
+    nav = ''.join(f'<li><a href="{link}">{link}</a></li>' for link in NAV_LINKS)
+
+    return (f"<!DOCTYPE html><html lang=\"en\"><head><title>{title} - Wikipedia</title></head><body>"
+            f"<div id=\"mw-navigation\"><ul>{nav}</ul></div>"
+            f"<div id=\"mw-content-text\"><h1>{title}</h1>{''.join(body)}</div>"
+            f"<div id=\"p-lang\"><ul class=\"interlanguage-links\">{interlanguage}</ul></div>"
+            f"</body></html>")
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    pages = 1000
+    latency = 0.0
+    corpus_dir = None
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        if not self.path.startswith('/wiki/'):
+            self.send_error(404)
+            return
+        title = unquote(self.path[len('/wiki/'):])
+        body = self.page_body(title)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def page_body(self, title):
+        if self.corpus_dir:
+            path = os.path.join(self.corpus_dir, title.replace('/', '_'))
+            if not os.path.isfile(path):
+                return None
+            with open(path, 'rb') as f:
+                return f.read()
+        if not title.startswith('Article_') or not title[8:].isdigit() or int(title[8:]) >= self.pages:
+            return None
+        return render_page(int(title[8:]), self.pages).encode('utf-8')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port=0, pages=1000, latency=0.0, corpus_dir=None):
+    """Start the fixture server on a background thread and return it.
+
+    The bound address is server.server_address; call server.shutdown() to stop.
+    """
+    handler = type('Handler', (FixtureHandler,),
+                   {'pages': pages, 'latency': latency, 'corpus_dir': corpus_dir})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local Wikipedia-like corpus")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--pages", type=int, default=1000, help="Size of the synthetic corpus")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each response")
+    parser.add_argument("--corpus", help="Directory of recorded pages (file name = article title) to serve instead")
+    args = parser.parse_args()
+
+    server = serve(args.port, args.pages, args.latency, args.corpus)
+    host, port = server.server_address
+    print(f"Serving {'recorded' if args.corpus else args.pages} pages on http://{host}:{port}/wiki/")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,435 @@
 import argparse
+import hashlib
+import html
+import math
 import os
+import re
+import shutil
+import sys
+import tempfile
+from collections import deque
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
+from array import array
+from scipy import sparse
+from scrapy import Request
 from scrapy.crawler import CrawlerProcess
 from scrapy.spiders import Spider
 from scrapy.utils.project import get_project_settings
-from urllib.parse import urlparse, urldefrag
+from urllib.parse import urlparse, urlsplit, urlunsplit
+from w3lib.url import canonicalize_url
 from itertools import combinations
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from langnet.graph_store import load_graph, save_graph
+
+
+FRONTIER_FILE = 'frontier.txt'
+EDGE_LOG = 'edges.log'
+RELEASED_LOG = 'released.log'
+OVERFLOW_LOG = 'overflow.log'
+OVERFLOW_SIZE = 100  # candidate links kept beyond the budget, to refill released slots
+
+
+class BloomFilter:
+    """Fixed-size URL set: no false negatives, about `error_rate` false positives."""
+
+    def __init__(self, capacity, error_rate=1e-4):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, item):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item):
+        """Add `item`; return True if it was not in the filter before."""
+        new = False
+        for p in self._positions(item):
+            if not self.bits[p >> 3] & (1 << (p & 7)):
+                self.bits[p >> 3] |= 1 << (p & 7)
+                new = True
+        return new
+
+
+def canonical_url(url):
+    """Normalise a URL (case, default port, escaping, fragment) so each page is queued once."""
+    parts = urlsplit(canonicalize_url(url))
+    host = parts.hostname or ''
+    if parts.port and parts.port != {'http': 80, 'https': 443}.get(parts.scheme):
+        host = f"{host}:{parts.port}"
+    return urlunsplit((parts.scheme, host, parts.path, parts.query, ''))
+
+
+class LanguageSetIndex:
+    """Distinct per-page language sets, each with a page count and article postings.
+
+    Pairwise edges are only expanded in build_graph, so recording a page is
+    linear in its number of languages.
+    """
+
+    def __init__(self):
+        self.langsets = {}
+        self.counts = []
+        self.postings = []
+        self.articles = []
+
+    def __len__(self):
+        return len(self.langsets)
+
+    def record(self, article_title, lang_codes):
+        key = frozenset(lang_codes)
+        index = self.langsets.get(key)
+        if index is None:
+            index = self.langsets[key] = len(self.counts)
+            self.counts.append(0)
+            self.postings.append(array('I'))
+        self.counts[index] += 1
+        self.postings[index].append(len(self.articles))
+        self.articles.append(article_title)
+
+    def build_graph(self, with_articles=False):
+        """Expand the recorded language sets into the weighted language graph.
+
+        Edge weight is the number of pages whose languages include both ends,
+        computed in one sparse product S.T @ diag(counts) @ S over the distinct
+        sets. with_articles also attaches the per-edge article lists of the
+        old graph format, which is quadratic in the languages per page.
+        """
+        langs = sorted({lang for key in self.langsets for lang in key})
+        index = {lang: i for i, lang in enumerate(langs)}
+        graph = nx.Graph()
+        if not langs:
+            return graph
+
+        rows = [r for key, r in self.langsets.items() for _ in key]
+        cols = [index[lang] for key in self.langsets for lang in key]
+        S = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(self.langsets), len(langs)))
+        counts = sparse.diags(np.asarray(self.counts, dtype=float))
+        pairs = sparse.triu(S.T @ counts @ S, k=1).tocoo()
+        graph.add_weighted_edges_from(
+            (langs[i], langs[j], int(w)) for i, j, w in zip(pairs.row, pairs.col, pairs.data))
+
+        if with_articles:
+            for key, r in self.langsets.items():
+                titles = [self.articles[a] for a in self.postings[r]]
+                for lang1, lang2 in combinations(sorted(key), 2):
+                    graph[lang1][lang2].setdefault('articles', []).extend(titles)
+        return graph
+
+
+class FileFrontier:
+    """FIFO of queued URLs kept in an append-only text file.
+
+    The file is also the record of every URL ever reserved, which is what a
+    persistent crawl replays to rebuild its seen-set on resume.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.writer = open(path, 'a', encoding='utf-8')
+        self.reader = open(path, 'r', encoding='utf-8')
+
+    def push(self, url):
+        self.writer.write(url + '\n')
+        self.writer.flush()
+
+    def pop(self):
+        line = self.reader.readline()
+        return line.rstrip('\n') or None
+
+    def close(self):
+        self.writer.close()
+        self.reader.close()
+
+
+def read_log(path, fields):
+    """Rows of a tab-separated crawl log; a torn last line from a crash is skipped."""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            row = line.rstrip('\n').split('\t')
+            if line.endswith('\n') and len(row) == fields:
+                yield row
+
 
 class WikipediaLanguageSpider(Spider):
     name = 'wikipedia_language_spider'
 
-    def __init__(self, start_urls, domain, max_pages, *args, **kwargs):
+    def __init__(self, start_urls, domains, max_pages, follow_languages=False,
+                 jobdir=None, frontier_window=None, extractor='fast', *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.start_urls = start_urls
-        self.allowed_domains = [urlparse(domain).netloc]
+        # 'wikipedia.org' admits every xx.wikipedia.org edition
+        self.allowed_domains = [urlparse(d).hostname or d for d in domains]
         self.max_pages = max_pages
-        self.visited = set()
-        self.graph = nx.Graph()
+        self.follow_languages = follow_languages
+        self.extractor = extractor
+        self.langsets = LanguageSetIndex()
+
+        # URLs are deduplicated and counted against max_pages when they are
+        # queued, not when their response arrives. Queued URLs wait in a disk
+        # FIFO and only `frontier_window` requests are handed to Scrapy at once.
+        # Links found once the budget is spent wait in a small overflow, so a
+        # slot released by a failed fetch (or a resume with a bigger budget)
+        # can still be used.
+        self.seen = BloomFilter(capacity=max(2 * max_pages, 1000))
+        self.overflow = deque()
+        self.done = None
+        self.reserved = 0
+        self.processed = 0
+        self.inflight = 0
+        self.frontier_window = frontier_window
+
+        # With a jobdir the crawl is persistent: the frontier, an append-only
+        # log of each page's languages and logs of released slots and overflow
+        # URLs live there, pages are not kept in memory, and a later run
+        # resumes from them.
+        self.jobdir = jobdir
+        self.edge_log = self.released_log = self.overflow_log = None
+        if jobdir:
+            os.makedirs(jobdir, exist_ok=True)
+            self.resume()
+            self.edge_log = open(os.path.join(jobdir, EDGE_LOG), 'a', encoding='utf-8')
+            self.released_log = open(os.path.join(jobdir, RELEASED_LOG), 'a', encoding='utf-8')
+            self.overflow_log = open(os.path.join(jobdir, OVERFLOW_LOG), 'a', encoding='utf-8')
+            self.frontier = FileFrontier(os.path.join(jobdir, FRONTIER_FILE))
+        else:
+            self.frontier_dir = tempfile.mkdtemp(prefix='wikiscrape_frontier_')
+            self.frontier = FileFrontier(os.path.join(self.frontier_dir, FRONTIER_FILE))
+
+    def resume(self):
+        """Rebuild seen/done state and the page budget from a previous run's jobdir."""
+        self.done = BloomFilter(capacity=max(2 * self.max_pages, 1000))
+        for (url,) in read_log(os.path.join(self.jobdir, FRONTIER_FILE), 1):
+            self.seen.add(url)
+            self.reserved += 1
+        for url, _, _ in read_log(os.path.join(self.jobdir, EDGE_LOG), 3):
+            self.done.add(url)
+            self.processed += 1
+        for (url,) in read_log(os.path.join(self.jobdir, RELEASED_LOG), 1):
+            self.done.add(url)
+            self.reserved -= 1
+        # overflow URLs that were reserved since are in the frontier, hence seen
+        for (url,) in read_log(os.path.join(self.jobdir, OVERFLOW_LOG), 1):
+            if url not in self.seen and url not in self.overflow:
+                self.overflow.append(url)
+        if self.reserved:
+            print(f"Resuming crawl: {self.processed} pages done, {self.reserved} reserved")
+
+    async def start(self):
+        for request in self.start_requests():
+            yield request
+
+    def start_requests(self):
+        for url in self.start_urls:
+            self.enqueue(url)
+        self.refill()
+        yield from self.drain()
+
+    def is_allowed(self, url):
+        host = urlsplit(url).hostname or ''
+        return any(host == d or host.endswith('.' + d) for d in self.allowed_domains)
+
+    def enqueue(self, url):
+        """Reserve a page slot for `url` unless it was seen already or the budget is spent.
+
+        With the budget spent, unseen URLs go to the overflow instead.
+        """
+        url = canonical_url(url)
+        if not self.is_allowed(url) or url in self.seen:
+            return False
+        if self.reserved >= self.max_pages:
+            if len(self.overflow) < OVERFLOW_SIZE and url not in self.overflow:
+                self.overflow.append(url)
+                if self.overflow_log:
+                    self.overflow_log.write(url + '\n')
+                    self.overflow_log.flush()
+            return False
+        self.seen.add(url)
+        self.reserved += 1
+        self.frontier.push(url)
+        return True
+
+    def release(self, url):
+        self.reserved -= 1
+        if self.released_log:
+            self.released_log.write(url + '\n')
+            self.released_log.flush()
+        self.refill()
+
+    def refill(self):
+        """Reserve free budget for overflow URLs (entries may have been seen since)."""
+        while self.overflow and self.reserved < self.max_pages:
+            self.enqueue(self.overflow.popleft())
+
+    def drain(self):
+        """Move queued URLs from the frontier to Scrapy, up to the in-flight window."""
+        window = self.frontier_window or 2 * self.crawler.settings.getint('CONCURRENT_REQUESTS')
+        while self.inflight < window:
+            url = self.frontier.pop()
+            if url is None:
+                break
+            if self.done is not None and url in self.done:
+                continue  # finished before a restart
+            self.inflight += 1
+            yield Request(url, callback=self.parse, errback=self.failed, dont_filter=True)
+
+    def failed(self, failure):
+        self.inflight -= 1
+        self.release(failure.request.url)  # give the slot back to another page
+        yield from self.drain()
+
+    def closed(self, reason):
+        self.frontier.close()
+        if self.jobdir:
+            self.edge_log.close()
+            self.released_log.close()
+            self.overflow_log.close()
+        else:
+            shutil.rmtree(self.frontier_dir, ignore_errors=True)
+
+    def record_page(self, url, article_title, lang_codes):
+        if self.edge_log:
+            self.edge_log.write(f"{url}\t{article_title}\t{' '.join(sorted(lang_codes))}\n")
+            self.edge_log.flush()
+        else:
+            self.langsets.record(article_title, lang_codes)
+
+    def build_graph(self, with_articles=False):
+        if self.jobdir:
+            return compact_edge_log(self.jobdir, with_articles)
+        return self.langsets.build_graph(with_articles)
+
+    def extract_links(self, response):
+        """Return ([(lang, href)] interlanguage links, iterable of internal article hrefs)."""
+        if self.extractor == 'fast':
+            links = extract_links_fast(response.body)
+            if links is not None:
+                return links
+        return extract_links_css(response)
 
     def parse(self, response):
-        url = urldefrag(response.url)[0]
+        self.inflight -= 1
+        url = canonical_url(response.url)
+
+        requested = canonical_url(response.meta.get('redirect_urls', [response.url])[0])
 
-        if url not in self.visited:
-            if len(self.visited) >= self.max_pages:
-                return
-            self.visited.add(url)
+        # A redirect can land on a page that was already queued or processed
+        if response.meta.get('redirect_urls') and not self.seen.add(url):
+            self.release(requested)
+            yield from self.drain()
+            return
 
-        if len(self.visited) % 10 == 0:
-            print(f"Progress: {len(self.visited)} pages processed...")
+        self.processed += 1
+        if self.processed % 10 == 0:
+            print(f"Progress: {self.processed} pages processed...")
 
         print(f"Visited: {url}")
 
         # Extract language codes
-        lang_codes = set()
-        for a in response.css('a[hreflang]'):
-            lang = a.attrib.get('hreflang')
-            if lang:
-                lang_codes.add(lang)
+        lang_links, article_links = self.extract_links(response)
+        lang_codes = {lang for lang, _ in lang_links}
 
-        lang_codes.add('en')  # Include English (base language)
+        lang_codes.add(edition_lang(url))  # Include the edition's own language
 
         # Skip pages with too many languages to speed up testing
         #if len(lang_codes) < 2 or len(lang_codes) > 10:
             #return
 
         article_title = url.split('/wiki/')[-1]
-        edge_count = 0
+        self.record_page(requested, article_title, lang_codes)
+        print(f"Recorded {len(lang_codes)} languages for: {article_title}")
+
+        # Continue crawling internal article links; past the budget, only
+        # until the overflow is full
+        for link in article_links:
+            self.enqueue(response.urljoin(link))
+            if self.reserved >= self.max_pages and len(self.overflow) >= OVERFLOW_SIZE:
+                break
+
+        # Hop to the same article in other editions
+        if self.follow_languages:
+            for _, link in lang_links:
+                if link and '/wiki/' in link:
+                    self.enqueue(response.urljoin(link))
+
+        yield from self.drain()
+
+
+# Attribute values are matched in place on the raw body; Wikipedia always
+# double-quotes them, single quotes are accepted for recorded pages.
+HREFLANG_TAG = re.compile(rb"""<a\s[^>]*\bhreflang=["']([^"']*)["'][^>]*>""")
+HREF_ATTR = re.compile(rb"""\bhref=["']([^"']*)["']""")
+ARTICLE_HREF = re.compile(rb"""<a\s[^>]*?\bhref=["'](/wiki/[^"'#:]*)["']""")
+
+
+def _attr(value):
+    value = value.decode('utf-8', errors='replace')
+    return html.unescape(value) if '&' in value else value
+
+
+def extract_links_fast(body):
+    """Regex extraction of the links parse() needs, without building a DOM.
 
-        for lang1, lang2 in combinations(lang_codes, 2):
-            edge = tuple(sorted((lang1, lang2)))
-            if not self.graph.has_edge(*edge):
-                self.graph.add_edge(*edge, articles=[article_title])
-            else:
-                self.graph[edge[0]][edge[1]]['articles'].append(article_title)
-            edge_count += 1
+    Interlanguage links are searched from the start of the interlanguage list
+    only; article links are yielded lazily so the caller can stop once the page
+    budget is spent. Returns None when nothing is found, so the caller can fall
+    back to extract_links_css for markup this doesn't recognise.
+    """
+    start = max(body.find(b'interlanguage-link'), 0)
+    lang_links = []
+    for tag in HREFLANG_TAG.finditer(body, start):
+        lang = _attr(tag.group(1))
+        if lang:
+            href = HREF_ATTR.search(tag.group(0))
+            lang_links.append((lang, _attr(href.group(1)) if href else None))
 
-        print(f"Added {edge_count} edges for: {article_title}")
+    first = ARTICLE_HREF.search(body)
+    if not lang_links and first is None:
+        return None
 
-        # Continue crawling internal article links
-        for link in response.css('a::attr(href)').getall():
-            if link.startswith('/wiki/') and ':' not in link and '#' not in link:
-                full_url = response.urljoin(link)
-                full_url = urldefrag(full_url)[0]
-                if full_url not in self.visited and len(self.visited) < self.max_pages:
-                    yield response.follow(full_url, self.parse)
+    def article_links():
+        for match in ARTICLE_HREF.finditer(body, first.start()):
+            yield _attr(match.group(1))
+
+    return lang_links, article_links() if first is not None else iter(())
+
+
+def extract_links_css(response):
+    """Selector-based extraction over the whole DOM; the reference for extract_links_fast."""
+    lang_links = []
+    for a in response.css('a[hreflang]'):
+        lang = a.attrib.get('hreflang')
+        if lang:
+            lang_links.append((lang, a.attrib.get('href')))
+    article_links = [link for link in response.css('a::attr(href)').getall()
+                     if link.startswith('/wiki/') and ':' not in link and '#' not in link]
+    return lang_links, article_links
+
+
+def compact_edge_log(jobdir, with_articles=False):
+    """Build the language graph from the edge log of a persistent crawl."""
+    langsets = LanguageSetIndex()
+    for _, article_title, langs in read_log(os.path.join(jobdir, EDGE_LOG), 3):
+        langsets.record(article_title, langs.split())
+    print(f"Compacted {len(langsets.articles)} logged pages into {len(langsets)} distinct language sets")
+    return langsets.build_graph(with_articles)
+
+
+def edition_lang(url):
+    """Language of the Wikipedia edition serving `url` (en.wikipedia.org -> 'en')."""
+    host = urlparse(url).netloc
+    if host.endswith('.wikipedia.org'):
+        return host.split('.')[0]
+    return 'en'
 
 
 def plot_graph(graph):
@@ -81,55 +445,203 @@ def plot_graph(graph):
     plt.show()
 
 
-def run_crawler(crawler_file):
+CRAWLER_DEFAULTS = {
+    'concurrency': 1,
+    'per_host_concurrency': 1,
+    'delay': 1.0,
+    'autothrottle': True,
+    'follow_languages': False,
+    'extractor': 'fast',
+}
+
+
+def read_crawler_file(crawler_file):
+    """Parse a crawler file.
+
+    Line 1 is the page budget, line 2 the allowed domain(s) (space or comma
+    separated, e.g. "https://en.wikipedia.org https://de.wikipedia.org" or
+    just "wikipedia.org" for every edition). The remaining lines are seed URLs
+    plus optional "key = value" settings:
+
+        concurrency = 16            total requests in flight
+        per_host_concurrency = 2    requests in flight per edition
+        delay = 1.0                 seconds between requests to one edition
+        autothrottle = true
+        follow_languages = true     also crawl the interlanguage links
+        extractor = fast            'fast' (regex, with fallback) or 'css' selectors
+        host de.wikipedia.org = 4, 0.5   per-host concurrency, delay
+    """
     with open(crawler_file, 'r') as file:
         lines = [line.strip() for line in file.readlines() if line.strip()]
-        max_nodes = int(lines[0])
-        domain = lines[1]
-        seeds = lines[2:]
+
+    config = dict(CRAWLER_DEFAULTS, hosts={}, seeds=[])
+    config['max_pages'] = int(lines[0])
+    config['domains'] = [d for d in re.split(r'[\s,]+', lines[1]) if d]
+    for line in lines[2:]:
+        if '=' not in line or line.startswith('http'):
+            config['seeds'].append(line)
+            continue
+        key, value = (part.strip() for part in line.split('=', 1))
+        if key.startswith('host '):
+            concurrency, delay = (v.strip() for v in value.split(','))
+            config['hosts'][key[5:].strip()] = {'concurrency': int(concurrency), 'delay': float(delay)}
+        elif key not in CRAWLER_DEFAULTS:
+            raise ValueError(f"Unknown crawler setting: {key}")
+        elif isinstance(CRAWLER_DEFAULTS[key], bool):
+            config[key] = value.lower() in ('1', 'true', 'yes', 'on')
+        else:
+            config[key] = type(CRAWLER_DEFAULTS[key])(value)
+    return config
+
+
+def crawl_settings(config):
+    """Scrapy settings for a crawl: global concurrency plus a politeness budget per host."""
+    return {
+        'LOG_ENABLED': False,
+        'CONCURRENT_REQUESTS': config['concurrency'],
+        'CONCURRENT_REQUESTS_PER_DOMAIN': config['per_host_concurrency'],
+        'DOWNLOAD_DELAY': config['delay'],
+        'DOWNLOAD_SLOTS': config['hosts'],
+        'AUTOTHROTTLE_ENABLED': config['autothrottle'],
+        'AUTOTHROTTLE_START_DELAY': config['delay'],
+        'AUTOTHROTTLE_MAX_DELAY': max(2.0, config['delay'] * 2),
+        'AUTOTHROTTLE_TARGET_CONCURRENCY': float(config['per_host_concurrency']),
+        'USER_AGENT': 'LanguageGraphBot/1.0 (https://example.com/contact)'
+    }
+
+
+def run_crawler(crawler_file, with_articles=False, jobdir=None):
+    config = read_crawler_file(crawler_file)
 
     results = {}
 
     class WrapperSpider(WikipediaLanguageSpider):
-        custom_settings = {
-            'LOG_ENABLED': False,
-            'DOWNLOAD_DELAY': 1.0,
-            'CONCURRENT_REQUESTS': 1,
-            'AUTOTHROTTLE_ENABLED': True,
-            'AUTOTHROTTLE_START_DELAY': 1.0,
-            'AUTOTHROTTLE_MAX_DELAY': 2.0,
-            'USER_AGENT': 'LanguageGraphBot/1.0 (https://example.com/contact)'
-        }
+        custom_settings = crawl_settings(config)
 
         def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
 
         def closed(self, reason):
+            super().closed(reason)
             print("Spider closed, finalizing graph...")
-            results['graph'] = self.graph
-            print(f"Graph has {self.graph.number_of_nodes()} nodes and {self.graph.number_of_edges()} edges")
+            graph = results['graph'] = self.build_graph(with_articles)
+            print(f"Graph has {graph.number_of_nodes()} nodes and {graph.number_of_edges()} edges")
 
 
     process = CrawlerProcess(get_project_settings())
-    process.crawl(WrapperSpider, start_urls=seeds,
-                  domain=domain, max_pages=max_nodes)
+    process.crawl(WrapperSpider, start_urls=config['seeds'], domains=config['domains'],
+                  max_pages=config['max_pages'], follow_languages=config['follow_languages'],
+                  extractor=config['extractor'], jobdir=jobdir)
     process.start()
 
     return results['graph']
 
 
-def compute_pagerank(graph):
-    return nx.pagerank(graph)
+def transition_matrix(graph):
+    """Node list, row-stochastic sparse transition matrix and dangling-node mask.
+
+    Edges are weighted by article count: the 'weight' attribute, or the
+    length of the 'articles' list in graphs crawled before weights existed.
+    """
+    nodes = list(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    rows, cols, weights = [], [], []
+    for u, v, d in graph.edges(data=True):
+        w = d.get('weight', len(d.get('articles', ())) or 1)
+        rows.append(index[u]); cols.append(index[v]); weights.append(w)
+        if not graph.is_directed() and u != v:
+            rows.append(index[v]); cols.append(index[u]); weights.append(w)
+    n = len(nodes)
+    W = sparse.csr_matrix((np.asarray(weights, dtype=float), (rows, cols)), shape=(n, n))
+    out_strength = np.asarray(W.sum(axis=1)).ravel()
+    dangling = out_strength == 0
+    scale = np.divide(1.0, out_strength, out=np.zeros(n), where=~dangling)
+    return nodes, sparse.diags(scale) @ W, dangling
+
+
+def pagerank_power(P, dangling, teleport, alpha=0.85, start=None, tol=1.0e-6, max_iter=100):
+    """Power iteration for one or many PageRank vectors at once.
+
+    `teleport` is an n x k matrix whose columns are teleport distributions;
+    column j of the result is the PageRank for teleport column j. Dangling
+    mass is redistributed along the teleport vector, as networkx does.
+    """
+    n = P.shape[0]
+    x = teleport.copy() if start is None else start / start.sum(axis=0)
+    PT = P.T.tocsr()
+    for _ in range(max_iter):
+        last = x
+        x = alpha * (PT @ last + teleport * last[dangling].sum(axis=0)) + (1 - alpha) * teleport
+        if (np.abs(x - last).sum(axis=0) < n * tol).all():
+            return x
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+
+def compute_pagerank(graph, alpha=0.85, nstart=None):
+    """Weighted PageRank; `nstart` ({node: rank}, e.g. a previous run) warm-starts the iteration."""
+    nodes, P, dangling = transition_matrix(graph)
+    if not nodes:
+        return {}
+    n = len(nodes)
+    teleport = np.full((n, 1), 1.0 / n)
+    start = None
+    if nstart:
+        start = np.array([[nstart.get(node, 1.0 / n)] for node in nodes])
+    x = pagerank_power(P, dangling, teleport, alpha=alpha, start=start)
+    return dict(zip(nodes, x[:, 0]))
+
+
+def personalized_pagerank(graph, seeds, alpha=0.85):
+    """Personalized PageRank for every seed language in one batched power iteration.
+
+    Returns {seed: {node: rank}}, each teleporting only to its seed.
+    """
+    nodes, P, dangling = transition_matrix(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    seeds = [seed for seed in seeds if seed in index]
+    teleport = np.zeros((len(nodes), len(seeds)))
+    teleport[[index[seed] for seed in seeds], np.arange(len(seeds))] = 1.0
+    x = pagerank_power(P, dangling, teleport, alpha=alpha)
+    return {seed: dict(zip(nodes, x[:, j])) for j, seed in enumerate(seeds)}
+
+
+def read_pagerank_values(path):
+    """{node: rank} from a --pagerank_values file of 'node rank' lines.
+
+    Personalized output ('seed node rank' lines) holds one ranking per seed,
+    so it can't warm-start a single PageRank and is rejected.
+    """
+    values = {}
+    with open(path, 'r') as f:
+        for number, line in enumerate(f, 1):
+            fields = line.split()
+            if not fields:
+                continue
+            if len(fields) == 3:
+                raise ValueError(f"{path} holds personalized PageRank ('seed node rank' lines); "
+                                 "warm-start from a plain --pagerank_values file instead")
+            if len(fields) != 2:
+                raise ValueError(f"{path}:{number}: expected 'node rank', got {line.strip()!r}")
+            values[fields[0]] = float(fields[1])
+    return values
 
 
 def main():
     parser = argparse.ArgumentParser(
         description="Wikipedia Language Graph Builder")
     parser.add_argument("--crawler", help="Input crawler file")
-    parser.add_argument("--input", help="Input graph GML file")
-    parser.add_argument("--crawler_graph", help="Output GML graph from crawler")
+    parser.add_argument("--input", help="Input graph: a binary graph directory or a GML file")
+    parser.add_argument("--jobdir", help="Persist crawl state and the per-page edge log here; rerun to resume")
+    parser.add_argument("--compact", metavar="JOBDIR", help="Build the graph from a persistent crawl's edge log")
+    parser.add_argument("--crawler_graph", help="Output graph from crawler (GML if the name ends in .gml, binary graph directory otherwise)")
     parser.add_argument("--pagerank_values", help="Output file for PageRank values")
+    parser.add_argument("--pagerank_init", help="Previous --pagerank_values file to warm-start PageRank from")
+    parser.add_argument("--personalized", metavar="SEEDS",
+                        help="Comma-separated seed languages, or 'all', for personalized PageRank "
+                             "(written to --pagerank_values as 'seed node rank' lines)")
     parser.add_argument("--plotgraph", action="store_true", help="Plot the graph")
+    parser.add_argument("--edge_articles", action="store_true",
+                        help="Attach the list of article titles to every crawled edge (slow on large crawls)")
 
     args = parser.parse_args()
     graph = None
@@ -137,26 +649,42 @@ def main():
     try:
         if args.crawler:
             print("Starting crawling...")
-            graph = run_crawler(args.crawler)
+            graph = run_crawler(args.crawler, with_articles=args.edge_articles, jobdir=args.jobdir)
             print(f"Crawling finished. Languages found: {len(graph.nodes())}")
             if args.crawler_graph:
-                nx.write_gml(graph, args.crawler_graph)
+                save_graph(graph, args.crawler_graph)
+                print(f"Graph saved to {args.crawler_graph}")
+
+        elif args.compact:
+            graph = compact_edge_log(args.compact, with_articles=args.edge_articles)
+            if args.crawler_graph:
+                save_graph(graph, args.crawler_graph)
                 print(f"Graph saved to {args.crawler_graph}")
 
         elif args.input:
             if not os.path.exists(args.input):
                 raise FileNotFoundError(f"Input file {args.input} not found.")
-            graph = nx.read_gml(args.input)
+            graph = load_graph(args.input)
             print(f"Graph loaded from {args.input}. Nodes: {len(graph.nodes())}")
 
         else:
-            raise ValueError("Either --crawler or --input must be provided.")
+            raise ValueError("One of --crawler, --compact or --input must be provided.")
 
         if args.plotgraph:
             plot_graph(graph)
 
-        if args.pagerank_values:
-            pagerank = compute_pagerank(graph)
+        if args.pagerank_values and args.personalized:
+            seeds = list(graph) if args.personalized == 'all' else args.personalized.split(',')
+            results = personalized_pagerank(graph, seeds)
+            with open(args.pagerank_values, 'w') as f:
+                for seed, pagerank in results.items():
+                    for node, rank in sorted(pagerank.items(), key=lambda item: item[1], reverse=True):
+                        f.write(f"{seed} {node} {rank:.6f}\n")
+            print(f"Personalized PageRank for {len(results)} seeds written to {args.pagerank_values}")
+
+        elif args.pagerank_values:
+            nstart = read_pagerank_values(args.pagerank_init) if args.pagerank_init else None
+            pagerank = compute_pagerank(graph, nstart=nstart)
             with open(args.pagerank_values, 'w') as f:
                 for node, rank in sorted(pagerank.items(), key=lambda item: item[1], reverse=True):
                     f.write(f"{node} {rank:.6f}\n")
@@ -0,0 +1,7 @@
+"""
+langnet
+
+Modules shared by the analysis folders (Subtitle translation, WikiScrape,
+Home Language Use). Scripts there put the repository root at the end of
+sys.path and import from here, e.g. `from langnet.graph_store import load_graph`.
+"""
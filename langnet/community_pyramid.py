@@ -0,0 +1,142 @@
+"""
+community_pyramid.py
+
+Keeps every level of the Louvain dendrogram instead of only the final
+best_partition, together with the aggregated (quotient) graph of each level:
+one node per community with its size and internal weight, one edge per pair
+of communities with the total weight between them.
+
+The pyramid is cached in pyramid_cache/<graph hash>_s<seed>.npz, so a
+cluster's subgraph or a level's summary can be pulled later without running
+Louvain again:
+
+    pyramid = load_or_build(G, random_state=0)
+    pyramid.partition()              # same as best_partition(G, random_state=0)
+    pyramid.cluster_subgraph(G, 2)   # members of cluster 2 at the top level
+    pyramid.level_summary(0)         # finest level, one row per community
+"""
+import os
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import community as community_louvain
+
+from .graph_store import graph_hash
+
+CACHE_DIR = 'pyramid_cache'
+
+
+class CommunityPyramid:
+    """Community label of every node at every dendrogram level, plus quotient graphs.
+
+    labels[level][i] is the community of nodes[i] at `level` (0 = finest,
+    -1 = the best_partition level).
+    """
+
+    def __init__(self, nodes, labels, quotients):
+        self.nodes = list(nodes)
+        self.labels = [np.asarray(label) for label in labels]
+        self.quotients = quotients  # per level: (size, internal, src, dst, weight) arrays
+
+    @classmethod
+    def build(cls, G, weight='weight', random_state=0):
+        dendrogram = community_louvain.generate_dendrogram(G, weight=weight, random_state=random_state)
+        nodes = list(G)
+        index = {node: i for i, node in enumerate(nodes)}
+        u = np.array([index[a] for a, b in G.edges()], dtype=np.int64)
+        v = np.array([index[b] for a, b in G.edges()], dtype=np.int64)
+        w = np.array([d.get(weight, 1) for _, _, d in G.edges(data=True)], dtype=np.float64)
+
+        labels, quotients = [], []
+        for level in range(len(dendrogram)):
+            part = community_louvain.partition_at_level(dendrogram, level)
+            label = np.array([part[node] for node in nodes], dtype=np.int64)
+            labels.append(label)
+            quotients.append(cls._quotient(label, u, v, w))
+        return cls(nodes, labels, quotients)
+
+    @staticmethod
+    def _quotient(label, u, v, w):
+        k = label.max() + 1
+        cu, cv = label[u], label[v]
+        inside = cu == cv
+        size = np.bincount(label, minlength=k)
+        internal = np.bincount(cu[inside], weights=w[inside], minlength=k)
+        a, b = np.minimum(cu[~inside], cv[~inside]), np.maximum(cu[~inside], cv[~inside])
+        pairs, inverse = np.unique(a * k + b, return_inverse=True)
+        weight = np.bincount(inverse, weights=w[~inside], minlength=len(pairs))
+        return size, internal, pairs // k, pairs % k, weight
+
+    @property
+    def depth(self):
+        return len(self.labels)
+
+    def partition(self, level=-1):
+        """{node: community} at `level`."""
+        return dict(zip(self.nodes, self.labels[level].tolist()))
+
+    def members(self, cluster_id, level=-1):
+        return [node for node, c in zip(self.nodes, self.labels[level].tolist()) if c == cluster_id]
+
+    def cluster_subgraph(self, G, cluster_id, level=-1):
+        """Subgraph of G induced by one community."""
+        return G.subgraph(self.members(cluster_id, level))
+
+    def quotient_graph(self, level=-1):
+        """Aggregated graph of `level`: communities as nodes (size, internal_weight)."""
+        size, internal, src, dst, weight = self.quotients[level]
+        Q = nx.Graph()
+        Q.add_nodes_from((c, {'size': int(size[c]), 'internal_weight': float(internal[c])})
+                         for c in range(len(size)))
+        Q.add_weighted_edges_from(zip(src.tolist(), dst.tolist(), weight.tolist()))
+        return Q
+
+    def level_summary(self, level=-1):
+        """One row per community: size, internal and external weight, '|'-separated members."""
+        size, internal, src, dst, weight = self.quotients[level]
+        external = (np.bincount(src, weights=weight, minlength=len(size))
+                    + np.bincount(dst, weights=weight, minlength=len(size)))
+        label = self.labels[level]
+        members = [[] for _ in range(len(size))]
+        for node, c in zip(self.nodes, label.tolist()):
+            members[c].append(str(node))
+        return pd.DataFrame({
+            'cluster': np.arange(len(size)),
+            'size': size,
+            'internal_weight': internal,
+            'external_weight': external,
+            'members': ['|'.join(m) for m in members],
+        }).sort_values('size', ascending=False, ignore_index=True)
+
+    def save(self, path):
+        arrays = {'nodes': np.array([str(node) for node in self.nodes], dtype=str)}
+        for level, (label, quotient) in enumerate(zip(self.labels, self.quotients)):
+            arrays[f"label_{level}"] = label
+            for name, array in zip(('size', 'internal', 'src', 'dst', 'weight'), quotient):
+                arrays[f"{name}_{level}"] = array
+        np.savez(path, depth=len(self.labels), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            depth = int(data['depth'])
+            labels = [data[f"label_{level}"] for level in range(depth)]
+            quotients = [tuple(data[f"{name}_{level}"] for name in ('size', 'internal', 'src', 'dst', 'weight'))
+                         for level in range(depth)]
+            return cls(data['nodes'].tolist(), labels, quotients)
+
+
+def load_or_build(G, weight='weight', random_state=0, cache_dir=CACHE_DIR):
+    """Cached pyramid for G (keyed on its content and the seed), built if missing."""
+    path = os.path.join(cache_dir, f"{graph_hash(G, weight)}_s{random_state}.npz")
+    if os.path.exists(path):
+        pyramid = CommunityPyramid.load(path)
+        # cached labels are strings; map back to G's node objects
+        by_name = {str(node): node for node in G}
+        pyramid.nodes = [by_name[name] for name in pyramid.nodes]
+        return pyramid
+    pyramid = CommunityPyramid.build(G, weight=weight, random_state=random_state)
+    os.makedirs(cache_dir, exist_ok=True)
+    pyramid.save(path)
+    return pyramid
@@ -0,0 +1,164 @@
+"""
+graph_store.py
+
+Compact binary graph format, used instead of GML round-trips.
+
+A stored graph is a directory of .npy arrays plus a small meta.json:
+
+    nodes.npy              node labels (interned node table, index = node id)
+    indptr.npy, indices.npy   CSR adjacency (both directions for undirected graphs)
+    edge_<attr>.npy        one typed column per edge attribute, aligned with indices
+    node_<attr>.npy        one typed column per node attribute
+
+Every array can be memory-mapped (read_csr), or the whole thing turned back
+into a networkx graph (read_graph). Scalar attributes only; list-valued ones
+(e.g. per-edge article lists) are skipped, so keep GML for those and for Gephi.
+An edge with an 'articles' list but no 'weight' (crawls from before edge
+weights existed) is stored with weight = len(articles), so it keeps its weight.
+Where an attribute is missing on some nodes/edges it reads back as NaN or ''.
+"""
+import hashlib
+import json
+import os
+
+import networkx as nx
+import numpy as np
+
+META_FILE = 'meta.json'
+
+
+def _column(values):
+    """Typed array for an attribute column, or None if it isn't scalar."""
+    present = [v for v in values if v is not None]
+    if not present:
+        return None
+    if all(isinstance(v, (bool, np.bool_)) for v in present):
+        return np.array([bool(v) for v in values])
+    if all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in present):
+        if len(present) == len(values):
+            return np.array(values, dtype=np.int64)
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    if all(isinstance(v, (int, float, np.number)) for v in present):
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    if all(isinstance(v, str) for v in present):
+        return np.array(['' if v is None else v for v in values], dtype=str)
+    return None
+
+
+def _with_weight(d):
+    if 'weight' in d or 'articles' not in d:
+        return d
+    articles = d['articles']
+    # GML reads a one-item list back as a bare string
+    return {**d, 'weight': 1 if isinstance(articles, str) else len(articles)}
+
+
+def write_graph(G, path):
+    """Write G as a binary graph directory at `path`."""
+    nodes = list(G)
+    index = {node: i for i, node in enumerate(nodes)}
+    n = len(nodes)
+
+    edges = list(G.edges(data=True))
+    src = [index[u] for u, _, _ in edges]
+    dst = [index[v] for _, v, _ in edges]
+    data = [_with_weight(d) for _, _, d in edges]
+    if not G.is_directed():
+        # store each undirected edge in both rows; self-loops once
+        back = [i for i, (u, v) in enumerate(zip(src, dst)) if u != v]
+        src, dst = src + [dst[i] for i in back], dst + [src[i] for i in back]
+        data = data + [data[i] for i in back]
+
+    order = np.lexsort((np.asarray(dst, dtype=np.int64), np.asarray(src, dtype=np.int64)))
+    src = np.asarray(src, dtype=np.int64)[order]
+    indices = np.asarray(dst, dtype=np.int64)[order]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, 'nodes.npy'), np.array([str(node) for node in nodes], dtype=str))
+    np.save(os.path.join(path, 'indptr.npy'), indptr)
+    np.save(os.path.join(path, 'indices.npy'), indices)
+
+    meta = {'directed': G.is_directed(), 'edge_attrs': [], 'node_attrs': [], 'skipped': []}
+    edge_keys = sorted({key for d in data for key in d})
+    for key in edge_keys:
+        column = _column([data[i].get(key) for i in order])
+        if column is None:
+            meta['skipped'].append(f"edge:{key}")
+            continue
+        np.save(os.path.join(path, f"edge_{key}.npy"), column)
+        meta['edge_attrs'].append(key)
+    node_keys = sorted({key for _, d in G.nodes(data=True) for key in d})
+    for key in node_keys:
+        column = _column([G.nodes[node].get(key) for node in nodes])
+        if column is None:
+            meta['skipped'].append(f"node:{key}")
+            continue
+        np.save(os.path.join(path, f"node_{key}.npy"), column)
+        meta['node_attrs'].append(key)
+
+    with open(os.path.join(path, META_FILE), 'w') as f:
+        json.dump(meta, f, indent=1)
+    if meta['skipped']:
+        print(f"graph_store: skipped non-scalar attributes {meta['skipped']} (use GML to keep them)")
+
+
+def read_csr(path, mmap=True):
+    """Memory-map a stored graph.
+
+    Returns (meta, nodes, indptr, indices, edge_attrs, node_attrs), where the
+    attribute dicts map names to arrays aligned with `indices` / `nodes`.
+    """
+    mode = 'r' if mmap else None
+
+    def load(name):
+        return np.load(os.path.join(path, name + '.npy'), mmap_mode=mode)
+
+    with open(os.path.join(path, META_FILE)) as f:
+        meta = json.load(f)
+    edge_attrs = {key: load(f"edge_{key}") for key in meta['edge_attrs']}
+    node_attrs = {key: load(f"node_{key}") for key in meta['node_attrs']}
+    return meta, load('nodes'), load('indptr'), load('indices'), edge_attrs, node_attrs
+
+
+def read_graph(path):
+    """Load a stored graph as a networkx Graph/DiGraph."""
+    meta, nodes, indptr, indices, edge_attrs, node_attrs = read_csr(path)
+    G = nx.DiGraph() if meta['directed'] else nx.Graph()
+    labels = nodes.tolist()
+    attr_lists = {key: column.tolist() for key, column in node_attrs.items()}
+    G.add_nodes_from((label, {key: values[i] for key, values in attr_lists.items()})
+                     for i, label in enumerate(labels))
+
+    src = np.repeat(np.arange(len(labels)), np.diff(indptr))
+    keep = np.ones(len(indices), dtype=bool) if meta['directed'] else src <= indices
+    columns = {key: column[keep].tolist() for key, column in edge_attrs.items()}
+    G.add_edges_from(
+        (labels[u], labels[v], {key: values[k] for key, values in columns.items()})
+        for k, (u, v) in enumerate(zip(src[keep].tolist(), np.asarray(indices)[keep].tolist())))
+    return G
+
+
+def graph_hash(G, weight='weight'):
+    """Content hash of the nodes and weighted edges, independent of insertion order (for cache keys)."""
+    digest = hashlib.sha256()
+    digest.update(repr(sorted(map(str, G))).encode('utf-8'))
+    edges = sorted((*sorted((str(u), str(v))), d.get(weight, 1)) for u, v, d in G.edges(data=True))
+    digest.update(repr(edges).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def load_graph(path):
+    """Read a graph from either a binary graph directory or a GML file."""
+    if os.path.isdir(path):
+        return read_graph(path)
+    return nx.read_gml(path)
+
+
+def save_graph(G, path):
+    """Write GML if `path` ends in .gml (e.g. for Gephi), the binary format otherwise."""
+    if path.endswith('.gml'):
+        nx.write_gml(G, path)
+    else:
+        write_graph(G, path)